@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import multiprocessing
+
+import numpy
+
+INF = float('inf')
+
+# матрица выгод для процессов пула, см. init_worker
+benefits = None
+
+
+def init_worker(A):
+    """Инициализация процесса пула: запомнить матрицу выгод"""
+    global benefits
+    benefits = A
+
+
+def bid(A, rows, prices, eps):
+    """
+    Вычислить ставки строк rows при ценах prices. Возвращает массивы
+    выбранных столбцов и ставок.
+    """
+    values = A[rows] - prices
+    cols = values.argmax(axis=1)
+    index = numpy.arange(len(rows))
+    best = values[index, cols]
+    if values.shape[1] > 1:
+        values[index, cols] = -INF
+        second = values.max(axis=1)
+    else:
+        second = best
+    return cols, prices[cols] + best - second + eps
+
+
+def bid_worker(args):
+    """Вычислить ставки части строк в процессе пула"""
+    rows, prices, eps = args
+    return bid(benefits, rows, prices, eps)
+
+
+class AuctionAlgorithm:
+    """
+    Аукционный алгоритм Берцекаса с масштабированием epsilon.
+    Строки - покупатели, столбцы - товары, выгода равна стоимости
+    со знаком минус. Все неназначенные строки делают ставки
+    одновременно (якобиевский вариант), ставки вычисляются над
+    массивами и могут распределяться по процессам пула.
+    """
+
+    def __init__(self, epsilon=None, scaling=5.0,
+                 processes=1, time_limit=None):
+        """
+        epsilon - требуемое конечное значение epsilon (по умолчанию
+        1 / (n + 1), что даёт точный оптимум для целых стоимостей),
+        scaling - во сколько раз уменьшается epsilon на каждой фазе,
+        processes - число процессов для вычисления ставок,
+        time_limit - ограничение времени в секундах: по его истечении
+        новая фаза не начинается, и возвращается назначение последней
+        завершённой фазы.
+        """
+        self.final_epsilon = epsilon
+        self.scaling = scaling
+        self.processes = processes
+        self.time_limit = time_limit
+        self.epsilon = None
+        self.prices = None
+
+    def solve(self, cost_matrix):
+        """
+        Вычисляет индексы пар строка-столбец с наименьшей общей
+        стоимостью. Возвращает список пар (строка, столбец) и число
+        раундов торгов. После решения self.epsilon содержит конечное
+        epsilon: стоимость найденного назначения превышает оптимум
+        не более чем на n * epsilon. Если в назначение попала
+        запрещённая (INF) пара, возбуждается ValueError.
+        """
+        C = numpy.array(cost_matrix, dtype=float)
+        n = len(C)
+
+        # запрещённые (INF) пары получают заведомо невыгодную цену
+        finite = numpy.isfinite(C)
+        if not finite.all():
+            span = C[finite].max() - C[finite].min() if finite.any() else 0
+            C[~finite] = C[finite].max() + (span + 1) * n if finite.any() \
+                         else 0
+        A = -C
+
+        final_epsilon = self.final_epsilon
+        if final_epsilon is None:
+            final_epsilon = 1.0 / (n + 1)
+        eps = max((A.max() - A.min()) / 2.0, final_epsilon)
+
+        pool = None
+        if self.processes > 1:
+            pool = multiprocessing.Pool(self.processes, init_worker, (A,))
+
+        start = time.time()
+        self.prices = numpy.zeros(n)
+        iteration_count = 0
+        try:
+            while True:
+                row_to_col, rounds = self.__auction(A, eps, pool)
+                iteration_count += rounds
+                self.epsilon = eps
+                if eps <= final_epsilon:
+                    break
+                if self.time_limit is not None and \
+                   time.time() - start > self.time_limit:
+                    break
+                eps = max(eps / self.scaling, final_epsilon)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        if not finite[numpy.arange(n), row_to_col].all():
+            raise ValueError('no feasible assignment')
+
+        results = list(enumerate(row_to_col.tolist()))
+
+        return results, iteration_count
+
+    def __auction(self, A, eps, pool):
+        """
+        Одна фаза аукциона с заданным epsilon, начиная с текущих цен.
+        Возвращает назначения строк и число раундов торгов.
+        """
+        n = len(A)
+        prices = self.prices
+        row_to_col = numpy.empty(n, dtype=int)
+        row_to_col.fill(-1)
+        col_to_row = numpy.empty(n, dtype=int)
+        col_to_row.fill(-1)
+
+        rounds = 0
+        while True:
+            rows = numpy.flatnonzero(row_to_col < 0)
+            if len(rows) == 0:
+                return row_to_col, rounds
+            rounds += 1
+
+            cols, bids = self.__bids(A, rows, prices, eps, pool)
+
+            # по каждому столбцу побеждает наибольшая ставка
+            order = numpy.lexsort((-bids, cols))
+            rows, cols, bids = rows[order], cols[order], bids[order]
+            first = numpy.ones(len(cols), dtype=bool)
+            first[1:] = cols[1:] != cols[:-1]
+            rows, cols, bids = rows[first], cols[first], bids[first]
+
+            owners = col_to_row[cols]
+            row_to_col[owners[owners >= 0]] = -1
+            row_to_col[rows] = cols
+            col_to_row[cols] = rows
+            prices[cols] = bids
+
+    def __bids(self, A, rows, prices, eps, pool):
+        """Вычислить ставки строк, при наличии пула - по частям"""
+        if pool is None or len(rows) < self.processes * 64:
+            return bid(A, rows, prices, eps)
+
+        parts = numpy.array_split(rows, self.processes)
+        results = pool.map(bid_worker, [(part, prices, eps)
+                                        for part in parts])
+        return (numpy.concatenate([cols for cols, bids in results]),
+                numpy.concatenate([bids for cols, bids in results]))
+
+
+# main
+if __name__ == '__main__':
+
+    import sys
+    stdout = sys.stdout
+
+    f = open('AuctionAlgorithm.txt', 'w+')
+
+    def test(msg, cost_matrix):
+        sys.stdout = f
+        print '\n', msg,
+        sys.stdout = stdout
+        auction = AuctionAlgorithm()
+        try:
+            indexes, iteration_count = auction.solve(cost_matrix)
+        except ValueError as e:
+            sys.stdout = f
+            print ':', e
+            sys.stdout = stdout
+            return
+        sys.stdout = f
+        print ':', iteration_count, 'iterations'
+        for index in indexes:
+            print index[0] + 1, '\t',
+        print
+        for index in indexes:
+            print index[1] + 1, '\t',
+        print
+        print 'Total cost:', sum(cost_matrix[i][j] for i, j in indexes)
+        print 'Epsilon:', auction.epsilon
+        sys.stdout = stdout
+
+    # вариант 1
+    cost_matrix = [
+        [6,     4,  13, 4,  19, 15, 11, 8],
+        [17,    15, 18, 14, 0,  7,  18, 7],
+        [3,     5,  11, 9,  7,  7,  18, 16],
+        [17,    10, 16, 19, 9,  6,  1,  5],
+        [14,    2,  10, 13, 11, 6,  4,  10],
+        [17,    11, 17, 12, 1,  10, 6,  19],
+        [13,    1,  4,  2,  2,  7,  2,  14],
+        [12,    15, 19, 11, 13, 1,  7,  8],
+    ]
+
+    test('1', cost_matrix)
+
+    # вариант 2
+    cost_matrix = [
+        [2,6,5,-1,6,1,8,4,6],
+        [2,1,2,7,9,-2,8,2,0],
+        [0,6,0,5,1,3,4,3,5],
+        [7,0,8,9,2,4,1,6,7],
+        [-1,1,0,-3,0,2,2,2,1],
+        [3,0,6,6,1,-2,2,4,0],
+        [1,7,1,9,4,8,2,6,8],
+        [5,1,5,2,2,6,-1,5,4],
+        [3,6,0,6,3,0,9,1,2],
+    ]
+
+    test('2', cost_matrix)
+
+    # вариант 3: первые две строки допускают только первый столбец
+    cost_matrix = [
+        [1,     INF,    INF],
+        [2,     INF,    INF],
+        [3,     4,      5],
+    ]
+
+    test('3', cost_matrix)
+
+    f.close()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy
+
+INF = float('inf')
+
+# допуск на нарушение ограничений и наименьший ведущий элемент
+TOLERANCE = 1e-9
+
+# через сколько итераций обратная базисная матрица вычисляется заново
+REFACTOR_INTERVAL = 50
+
+
+class Basis:
+    """
+    Базис задачи: индексы базисных столбцов, для небазисных
+    переменных - находятся ли они на верхней границе, и обратная
+    базисная матрица
+    """
+
+    def __init__(self, columns, at_upper, inverse):
+        self.columns = columns
+        self.at_upper = at_upper
+        self.inverse = inverse
+
+    def copy(self):
+        return Basis(list(self.columns), self.at_upper.copy(),
+                     self.inverse.copy())
+
+
+class BoundedSimplex:
+    """
+    Двойственный симплекс-метод для задачи ЛП
+        c x -> max,  A x = b,  low <= x <= up
+    с конечными границами всех переменных. К задаче добавляются
+    искусственные переменные с границами [0, 0], они образуют
+    начальный базис. При конечных границах любой базис двойственно
+    допустим, если небазисные переменные стоят на границе, выбранной
+    по знаку приведённой стоимости, поэтому первая фаза не нужна:
+    задача решается двойственным симплекс-методом из любого базиса,
+    в том числе из оптимального базиса родительской подзадачи, у
+    которой была другая граница одной переменной.
+    """
+
+    def __init__(self, A, b, c):
+        A = numpy.array(A, dtype=float)
+        self.m, self.n = A.shape
+        self.A = numpy.hstack((A, numpy.eye(self.m)))
+        self.b = numpy.array(b, dtype=float)
+        self.c = numpy.array(c, dtype=float)
+        # минимизируется -c x, искусственные переменные стоят 0
+        self.cost = numpy.concatenate((-self.c, numpy.zeros(self.m)))
+
+    def initial_basis(self):
+        """Базис из искусственных переменных"""
+        return Basis(range(self.n, self.n + self.m),
+                     numpy.zeros(self.n + self.m, dtype=bool),
+                     numpy.eye(self.m))
+
+    def solve(self, low, up, basis=None, max_iterations=None):
+        """
+        Решает задачу с границами low, up, начиная с базиса basis
+        (по умолчанию - искусственного). Возвращает (статус, x, cx,
+        базис), статус - 'Optimal', 'Infeasible' или 'Not Solved'
+        (исчерпано max_iterations итераций; тогда cx - оценка сверху
+        оптимума, так как базис двойственно допустим). Переданный базис
+        не изменяется.
+        """
+        n, m = self.n, self.m
+        low = numpy.concatenate((numpy.array(low, dtype=float),
+                                 numpy.zeros(m)))
+        up = numpy.concatenate((numpy.array(up, dtype=float),
+                                numpy.zeros(m)))
+        if not (numpy.isfinite(low).all() and numpy.isfinite(up).all()):
+            raise ValueError('bounded simplex requires finite bounds')
+        if (low > up).any():
+            return 'Infeasible', None, None, None
+
+        basis = self.initial_basis() if basis is None else basis.copy()
+        self.iteration_count = 0
+        status = 'Not Solved'
+        while max_iterations is None or self.iteration_count < max_iterations:
+            if self.iteration_count % REFACTOR_INTERVAL == \
+               REFACTOR_INTERVAL - 1:
+                basis.inverse = numpy.linalg.inv(self.A[:, basis.columns])
+            x, d = self.__solution(basis, low, up)
+            status = self.__iterate(basis, x, d, low, up)
+            if status is not None:
+                break
+            self.iteration_count += 1
+        else:
+            x, d = self.__solution(basis, low, up)
+            status = 'Not Solved'
+
+        if status == 'Infeasible':
+            return status, None, None, None
+        return status, x[:n], self.c.dot(x[:n]), basis
+
+    def __solution(self, basis, low, up):
+        """
+        Значения переменных и приведённые стоимости для базиса.
+        Небазисные переменные с приведённой стоимостью не того знака
+        переносятся на другую границу, что сохраняет двойственную
+        допустимость
+        """
+        B = basis.columns
+        y = self.cost[B].dot(basis.inverse)
+        d = self.cost - y.dot(self.A)
+        d[B] = 0
+
+        at_upper = basis.at_upper
+        at_upper[(d < -TOLERANCE) & (low < up)] = True
+        at_upper[(d > TOLERANCE) | (low == up)] = False
+        at_upper[B] = False
+
+        x = numpy.where(at_upper, up, low)
+        x[B] = 0
+        x[B] = basis.inverse.dot(self.b - self.A.dot(x))
+        return x, d
+
+    def __iterate(self, basis, x, d, low, up):
+        """
+        Одна итерация двойственного симплекс-метода. Возвращает статус,
+        если задача решена, иначе None
+        """
+        B = basis.columns
+        xB = x[B]
+        below = low[B] - xB
+        above = xB - up[B]
+        violation = numpy.maximum(below, above)
+        r = int(violation.argmax())
+        if violation[r] <= TOLERANCE * (1 + abs(xB[r])):
+            return 'Optimal'
+
+        # строка симплекс-таблицы для покидающей базис переменной
+        alpha = basis.inverse[r].dot(self.A)
+        free = (low < up)
+        free[B] = False
+        at_upper = basis.at_upper
+        if below[r] > 0:
+            # переменная должна увеличиться до нижней границы
+            candidates = free & (((~at_upper) & (alpha < -TOLERANCE)) |
+                                 (at_upper & (alpha > TOLERANCE)))
+        else:
+            candidates = free & (((~at_upper) & (alpha > TOLERANCE)) |
+                                 (at_upper & (alpha < -TOLERANCE)))
+        if not candidates.any():
+            return 'Infeasible'
+
+        ratios = numpy.where(candidates, abs(d) / numpy.maximum(abs(alpha),
+                                                                 TOLERANCE),
+                             INF)
+        q = int(ratios.argmin())
+
+        # заменить базисную переменную r на q
+        leaving = B[r]
+        at_upper[leaving] = below[r] <= 0
+        at_upper[q] = False
+        B[r] = q
+        w = basis.inverse.dot(self.A[:, q])
+        pivot = basis.inverse[r] / w[r]
+        basis.inverse -= numpy.outer(w, pivot)
+        basis.inverse[r] = pivot
+        return None
+
+
+# main
+if __name__ == '__main__':
+
+    import sys
+    stdout = sys.stdout
+
+    f = open('BoundedSimplex.txt', 'w+')
+
+    def test(msg, A, b, c, low, up, branch=None):
+        simplex = BoundedSimplex(A, b, c)
+        status, x, cx, basis = simplex.solve(low, up)
+        sys.stdout = f
+        print '\n', msg, ':', status, simplex.iteration_count, 'iterations'
+        if x is not None:
+            print [round(xi, 6) for xi in x]
+            print 'cx =', round(cx, 6)
+        sys.stdout = stdout
+        if branch is None or basis is None:
+            return
+
+        # изменить границу одной переменной и решить из того же базиса
+        j, new_up = branch
+        up = list(up)
+        up[j] = new_up
+        status, x, cx, basis = simplex.solve(low, up, basis)
+        sys.stdout = f
+        print 'x%d <= %s:' % (j + 1, new_up), status, \
+              simplex.iteration_count, 'iterations'
+        if x is not None:
+            print [round(xi, 6) for xi in x]
+            print 'cx =', round(cx, 6)
+        sys.stdout = stdout
+
+    # вариант 1
+    A = [
+        [1,0,0,12,1,-3,4,-1],
+        [0,1,0,11,12,3,5,3],
+        [0,0,1,1,0,22,-2,1],
+    ]
+
+    b = [40,107,61]
+    c = [2,1,-2,-1,4,-5,5,5]
+    low = [0,0,0,0,0,0,0,0]
+    up = [3,5,5,3,4,5,6,3]
+
+    test('1', A, b, c, low, up, (5, 3))
+
+    # вариант 2
+    A = [
+        [1,0,0,3,1,-3,4,-1],
+        [0,1,0,4,-3,3,5,3],
+        [0,0,1,1,0,2,-2,1],
+    ]
+
+    b = [30,78,18]
+    c = [2,1,-2,-1,4,-5,5,5]
+    low = [0,0,0,0,0,0,0,0]
+    up = [5,5,3,5,6,7,7,8]
+
+    test('2', A, b, c, low, up)
+
+    f.close()
@@ -1,22 +1,90 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import collections
+import heapq
 import math
+import multiprocessing
 
 import pulp.constants
 from pulp import LpVariable, LpProblem, lpSum, LpInteger
 
+from BoundedSimplex import BoundedSimplex
+
+INF = float('inf')
+
 ZERO = 1e-6
 
+STRATEGIES = ('best', 'depth', 'estimate')
+
+# наименьшая ожидаемая величина уменьшения значения задачи ЛП
+# в оценке переменной ветвления, см. PseudoCost
+EPSILON = 1e-6
+
+# интервал опроса результатов процессов пула, секунды
+POLL_INTERVAL = 0.001
+
+# задача ЛП и общий рекорд процесса пула, см. init_worker
+worker_model = None
+worker_c = None
+incumbent = None
+
 LpProblem.sortedVariables = lambda self: sorted(
                                 self.variables(),
                                 key = lambda x: int(x.name[1:]))
 
 
-def calc_non_int_index(variables):
+class Frontier:
+    """
+    Список подзадач, упорядоченный по стратегии выбора:
+    'best' - подзадача с наибольшей оценкой сверху (значением задачи
+    ЛП родительской подзадачи), 'depth' - последняя добавленная (поиск
+    в глубину), 'estimate' - подзадача с наибольшей оценкой значения
+    лучшего целочисленного решения, см. estimate.
+    slope - уменьшение значения задачи на единицу суммарной
+    нецелочисленности, задаётся по корневой подзадаче
+    """
+
+    def __init__(self, strategy='depth'):
+        if strategy not in STRATEGIES:
+            raise ValueError('unknown strategy: %s' % strategy)
+        self.strategy = strategy
+        self.heap = []
+        self.count = 0
+        self.slope = None
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, bound, estimate, depth, node):
+        """Добавить подзадачу node с оценкой сверху bound"""
+        count = self.count
+        self.count += 1
+        heapq.heappush(self.heap,
+                       (self.__key(bound, estimate, depth, count), count,
+                        bound, depth, node))
+
+    def pop(self):
+        """Взять очередную подзадачу, возвращает (bound, depth, node)"""
+        key, count, bound, depth, node = heapq.heappop(self.heap)
+        return bound, depth, node
+
+    def prune(self, r0):
+        """Удалить подзадачи с оценкой сверху не больше рекорда r0"""
+        self.heap = [entry for entry in self.heap if entry[2] > r0]
+        heapq.heapify(self.heap)
+
+    def __key(self, bound, estimate, depth, count):
+        if self.strategy == 'best':
+            return (-bound, -depth)
+        if self.strategy == 'estimate':
+            return (-estimate, -depth)
+        return (-count,)
+
+
+def calc_non_int_index(values):
     """Возвращает индекс первой нецелой переменной решения"""
-    for i, var in enumerate(variables):
-        value = var.varValue
+    for i, value in enumerate(values):
         if abs(value - round(value)) > ZERO:
             return i
     return None
@@ -40,38 +108,287 @@ def prepare_problem(A, b, c, bounds):
     return problem
 
 
-def divide(problem, non_int_index, l, A, b, c):
+def infeasibility(values):
+    """Сумма расстояний значений переменных до ближайшего целого"""
+    return sum(abs(value - round(value)) for value in values)
+
+
+def estimate(cx, values, non_int_index, slope):
     """
-    Возвращает 2 новые проблемы с модифицированными
-    ограничениями на переменные
+    Оценки значения лучшего целочисленного решения в двух подзадачах,
+    полученных ветвлением по переменной non_int_index решения values
+    со значением cx (метод наилучшей проекции): cx минус slope на
+    сумму расстояний переменных до ближайшего целого, где для
+    переменной ветвления берётся расстояние до новой границы
     """
-    bounds = [{'low_bound' : var.lowBound, 'up_bound' : var.upBound}
-              for var in problem.sortedVariables()]
+    l = values[non_int_index]
+    f = l - math.floor(l)
+    rest = infeasibility(values) - min(f, 1 - f)
+    return cx - slope * (rest + f), cx - slope * (rest + 1 - f)
 
+
+def divide(bounds, non_int_index, l):
+    """
+    Возвращает 2 новых набора ограничений на переменные
+    """
     bounds_left = [bound.copy() for bound in bounds]
     bounds_right = [bound.copy() for bound in bounds]
 
     bounds_left[non_int_index]['up_bound'] = int(math.floor(l))
     bounds_right[non_int_index]['low_bound'] = int(math.floor(l) + 1)
 
-    return (prepare_problem(A, b, c, bounds_left),
-            prepare_problem(A, b, c, bounds_right))
+    return bounds_left, bounds_right
 
 
-def iteration(problems, r0, A, b, c):
-    """Итерация метода ветвей и границ"""
-    # Шаг 1: взять проблему из списка
-    problem = problems.pop()
+def set_bounds(variables, bounds):
+    """Устанавливает ограничения на переменные задачи"""
+    for var, bound in zip(variables, bounds):
+        var.lowBound = bound['low_bound']
+        var.upBound = bound['up_bound']
 
-    # Шаг 2: решить проблему
-    status = problem.solve()
-    variables = problem.sortedVariables()
 
-    # Если решения нет - возврат
-    if not pulp.constants.LpStatus[status] == 'Optimal':
+class PulpModel:
+    """
+    Задача ЛП в PuLP, построенная один раз; подзадачи меняют только
+    границы переменных. Базис между подзадачами не передаётся
+    """
+
+    def __init__(self, A, b, c, bounds):
+        self.problem = prepare_problem(A, b, c, bounds)
+        self.variables = self.problem.sortedVariables()
+        self.c = c
+
+    def solve(self, bounds, warm=None):
+        """Возвращает (значения переменных, None) или None"""
+        set_bounds(self.variables, bounds)
+        status = self.problem.solve()
+        if not pulp.constants.LpStatus[status] == 'Optimal':
+            return None
+        return [var.varValue for var in self.variables], None
+
+    def bound(self, bounds, warm=None, max_iterations=None):
+        """
+        Оценка сверху значения задачи ЛП или None, если решения нет.
+        Число итераций PuLP не ограничивается, задача решается точно
+        """
+        res = self.solve(bounds)
+        if res is None:
+            return None
+        return sum(value * ci for value, ci in zip(res[0], self.c))
+
+
+class SimplexModel:
+    """
+    Задача ЛП для двойственного симплекс-метода BoundedSimplex.
+    Подзадача решается из оптимального базиса родительской, обычно
+    за несколько итераций. Границы всех переменных должны быть конечны
+    """
+
+    def __init__(self, A, b, c, bounds):
+        self.simplex = BoundedSimplex(A, b, c)
+
+    def solve(self, bounds, warm=None):
+        """Возвращает (значения переменных, базис) или None"""
+        status, x, cx, basis = self.simplex.solve(*self.__limits(bounds),
+                                                  basis=warm)
+        if not status == 'Optimal':
+            return None
+        return x.tolist(), basis
+
+    def bound(self, bounds, warm=None, max_iterations=None):
+        """
+        Оценка сверху значения задачи ЛП или None, если решения нет.
+        После max_iterations итераций возвращается значение текущего
+        двойственно допустимого базиса
+        """
+        status, x, cx, basis = self.simplex.solve(
+            *self.__limits(bounds), basis=warm,
+            max_iterations=max_iterations)
+        if status == 'Infeasible':
+            return None
+        return cx
+
+    def __limits(self, bounds):
+        """Списки нижних и верхних границ переменных"""
+        low = [-INF if bound['low_bound'] is None else bound['low_bound']
+               for bound in bounds]
+        up = [INF if bound['up_bound'] is None else bound['up_bound']
+              for bound in bounds]
+        return low, up
+
+
+MODELS = {
+    'pulp': PulpModel,
+    'simplex': SimplexModel,
+}
+
+
+class FirstFractional:
+    """Ветвление по первой нецелой переменной"""
+
+    def select(self, model, bounds, basis, values, cx, r0):
+        """
+        Выбрать переменную ветвления для решения values задачи ЛП
+        model со значением cx и базисом basis в подзадаче с границами
+        bounds; r0 - рекорд. Возвращает индекс переменной или None,
+        если решение целочисленное
+        """
+        return calc_non_int_index(values)
+
+    def update(self, index, direction, fraction, gain):
+        """
+        Учесть уменьшение gain значения задачи ЛП в подзадаче,
+        полученной ветвлением по переменной index вниз (direction 0)
+        или вверх (1); fraction - расстояние от значения переменной
+        до новой границы
+        """
+        pass
+
+    def candidates(self, values):
+        """Нецелые переменные: пары (индекс, дробная часть)"""
+        return [(i, value - math.floor(value))
+                for i, value in enumerate(values)
+                if abs(value - round(value)) > ZERO]
+
+
+class MostFractional(FirstFractional):
+    """Ветвление по переменной с дробной частью, ближайшей к 1/2"""
+
+    def select(self, model, bounds, basis, values, cx, r0):
+        candidates = self.candidates(values)
+        if not candidates:
+            return None
+        return max(candidates, key=lambda (i, f): min(f, 1 - f))[0]
+
+
+class PseudoCost(FirstFractional):
+    """
+    Ветвление по псевдостоимостям - среднему уменьшению значения
+    задачи ЛП на единицу изменения переменной при ветвлении вниз и
+    вверх, накопленному за время поиска. Оценка переменной -
+    произведение ожидаемых уменьшений в двух подзадачах; для
+    переменной без наблюдений в каком-либо направлении берётся
+    среднее по всем наблюдавшимся переменным
+    """
+
+    def __init__(self):
+        self.sums = collections.defaultdict(float)
+        self.counts = collections.defaultdict(int)
+        self.total = [0.0, 0.0]
+        self.observations = [0, 0]
+
+    def update(self, index, direction, fraction, gain):
+        gain = max(gain, 0) / fraction
+        self.sums[index, direction] += gain
+        self.counts[index, direction] += 1
+        self.total[direction] += gain
+        self.observations[direction] += 1
+
+    def cost(self, index, direction):
+        """Псевдостоимость переменной index в направлении direction"""
+        count = self.counts.get((index, direction), 0)
+        if count:
+            return self.sums[index, direction] / count
+        if self.observations[direction]:
+            return self.total[direction] / self.observations[direction]
+        return 1.0
+
+    def score(self, down, up):
+        """Оценка переменной по уменьшениям значения в подзадачах"""
+        return max(down, EPSILON) * max(up, EPSILON)
+
+    def estimated_score(self, i, f):
+        """Оценка переменной i с дробной частью f по псевдостоимостям"""
+        return self.score(f * self.cost(i, 0), (1 - f) * self.cost(i, 1))
+
+    def select(self, model, bounds, basis, values, cx, r0):
+        candidates = self.candidates(values)
+        if not candidates:
+            return None
+        return max(candidates,
+                   key=lambda (i, f): self.estimated_score(i, f))[0]
+
+
+class ReliabilityBranching(PseudoCost):
+    """
+    Ветвление по надёжным псевдостоимостям. Для переменных, у которых
+    в каком-либо направлении меньше reliability наблюдений, обе
+    подзадачи решаются пробно (сильное ветвление) не более чем за
+    iterations итераций симплекс-метода, полученные уменьшения
+    значения пополняют псевдостоимости. Пробно решаются не более
+    candidates переменных с лучшей оценкой по псевдостоимостям.
+    Подзадача без решения или не лучше рекорда считается бесконечно
+    хуже родительской. При reliability=INF - сильное ветвление для
+    всех проверяемых переменных
+    """
+
+    def __init__(self, reliability=4, iterations=20, candidates=10):
+        PseudoCost.__init__(self)
+        self.reliability = reliability
+        self.iterations = iterations
+        self.max_candidates = candidates
+
+    def select(self, model, bounds, basis, values, cx, r0):
+        candidates = self.candidates(values)
+        if not candidates:
+            return None
+        candidates.sort(key=lambda (i, f): -self.estimated_score(i, f))
+
+        best, best_score = None, -1
+        for rank, (i, f) in enumerate(candidates):
+            reliable = min(self.counts.get((i, 0), 0),
+                           self.counts.get((i, 1), 0)) >= self.reliability
+            if reliable or rank >= self.max_candidates:
+                score = self.estimated_score(i, f)
+            else:
+                gains = []
+                for direction, child in enumerate(divide(bounds, i,
+                                                         values[i])):
+                    bound = model.bound(child, basis, self.iterations)
+                    if bound is None or bound <= r0:
+                        gains.append(INF)
+                    else:
+                        gains.append(cx - bound)
+                        self.update(i, direction, (f, 1 - f)[direction],
+                                    cx - bound)
+                score = self.score(*gains)
+            if score > best_score:
+                best, best_score = i, score
+        return best
+
+
+BRANCHING = {
+    'first': FirstFractional,
+    'fractional': MostFractional,
+    'pseudocost': PseudoCost,
+    'reliability': ReliabilityBranching,
+}
+
+
+def evaluate(model, node, c):
+    """
+    Решить задачу ЛП подзадачи node. Возвращает (значения переменных,
+    базис, cx) или None, если решения нет
+    """
+    bounds, warm, branch = node
+    res = model.solve(bounds, warm)
+    if res is None:
         return None
+    values, basis = res
+    return values, basis, sum(value * ci for value, ci in zip(values, c))
 
-    cx = sum(var.varValue * ci for var, ci in zip(variables, c))
+
+def expand(model, frontier, rule, bound, depth, node, res, r0):
+    """
+    Обработать решение res задачи ЛП подзадачи node (см. evaluate):
+    учесть его в правиле ветвления rule и, если оно лучше рекорда r0,
+    вернуть целочисленное решение (значения переменных, cx) или
+    добавить в список frontier две новые подзадачи
+    """
+    bounds, warm, branch = node
+    values, basis, cx = res
+    if branch is not None:
+        rule.update(*(branch + (bound - cx,)))
 
     # Если cx <= r0 - возврат, решение не оптимальное
     if cx <= r0:
@@ -79,34 +396,177 @@ def iteration(problems, r0, A, b, c):
 
     # Шаг 3: проверка решения на целочисленность. Если выполняется
     # условие целочисленности - возврат, решение оптимально
-    non_int_index = calc_non_int_index(variables)
+    non_int_index = rule.select(model, bounds, basis, values, cx, r0)
     if non_int_index is None:
-        return variables, cx
+        return [float(round(value)) for value in values], cx
     else:
         # Шаг 4: создать 2 новые проблемы, добавить в список
-        l = variables[non_int_index].varValue
-        problems.extend(divide(problem, non_int_index, l, A, b, c))
+        l = values[non_int_index]
+        if frontier.slope is None:
+            frontier.slope = (cx - r0) / infeasibility(values)
+        estimates = estimate(cx, values, non_int_index, frontier.slope)
+        fractions = (l - math.floor(l), math.floor(l) + 1 - l)
+        children = divide(bounds, non_int_index, l)
+        for direction in xrange(2):
+            frontier.push(cx, estimates[direction], depth + 1,
+                          (children[direction], basis,
+                           (non_int_index, direction, fractions[direction])))
         return None
 
 
-def solve(A, b, c, bounds):
-    """Решает проблему методом ветвей и границ"""
-    problems = [prepare_problem(A, b, c, bounds)]
+def iteration(model, frontier, rule, r0, c):
+    """
+    Итерация метода ветвей и границ. Задача ЛП model строится один
+    раз, подзадачи в списке frontier - наборы ограничений на
+    переменные, базис родительской подзадачи для тёплого старта и
+    ветвление, которым получена подзадача; оценка сверху подзадачи -
+    значение задачи ЛП родительской. Переменную ветвления выбирает
+    правило rule
+    """
+    # Шаг 1: взять проблему из списка
+    bound, depth, node = frontier.pop()
+
+    # Шаг 2: решить проблему
+    res = evaluate(model, node, c)
+
+    # Если решения нет - возврат
+    if res is None:
+        return None
+
+    return expand(model, frontier, rule, bound, depth, node, res, r0)
+
+
+def init_worker(engine, A, b, c, bounds, shared_incumbent):
+    """
+    Инициализация процесса пула: построить задачу ЛП и запомнить
+    общий рекорд
+    """
+    global worker_model, worker_c, incumbent
+    worker_model = MODELS[engine](A, b, c, bounds)
+    worker_c = c
+    incumbent = shared_incumbent
+
+
+def evaluate_worker(args):
+    """
+    Решить подзадачу в процессе пула. Если рекорд r0 не передан,
+    берётся общий рекорд, обновлённый главным процессом
+    """
+    bound, node, r0 = args
+    if r0 is None:
+        r0 = incumbent.value
+    if bound <= r0:
+        return None
+    return evaluate(worker_model, node, worker_c)
+
+
+def parallel_search(model, frontier, rule, c, processes, deterministic,
+                    worker_args):
+    """
+    Главный процесс хранит список подзадач и раздаёт их процессам
+    пула, не более двух подзадач на процесс одновременно; решения
+    задач ЛП обрабатываются в главном процессе (см. expand), там же
+    выполняется пробное решение подзадач правилом ветвления. Рекорд
+    общий для всех процессов и обновляется сразу при улучшении,
+    поэтому процессы отбрасывают подзадачи, которые не лучше
+    последнего найденного решения.
+    При deterministic результаты обрабатываются в порядке раздачи
+    подзадач, а процесс сравнивает подзадачу с рекордом на момент её
+    раздачи, поэтому при том же числе процессов поиск повторяется в
+    точности. Возвращает (решение, r0, число итераций)
+    """
+    shared_incumbent = multiprocessing.Value('d', 0)
+    pool = multiprocessing.Pool(processes, init_worker,
+                                worker_args + (shared_incumbent,))
+    pending = []
     iteration_count = 0
     answer = None
     r0 = 0
 
-    while (problems != []):
-        iteration_count += 1
-        res = iteration(problems, r0, A, b, c)     
-        if res is not None:
-            answer, r0 = res
+    try:
+        while len(frontier) > 0 or pending:
+            # раздать подзадачи процессам пула
+            while len(frontier) > 0 and len(pending) < processes * 2:
+                bound, depth, node = frontier.pop()
+                iteration_count += 1
+                task = (bound, node, r0 if deterministic else None)
+                pending.append((bound, depth, node, pool.apply_async(
+                    evaluate_worker, (task,))))
+
+            # дождаться первой по порядку или любой решённой подзадачи
+            if deterministic:
+                pending[0][-1].wait()
+                k = 0
+            else:
+                ready = [k for k, entry in enumerate(pending)
+                         if entry[-1].ready()]
+                if not ready:
+                    pending[0][-1].wait(POLL_INTERVAL)
+                    continue
+                k = ready[0]
+            bound, depth, node, result = pending.pop(k)
+            res = result.get()
+            if res is None:
+                continue
+
+            res = expand(model, frontier, rule, bound, depth, node, res, r0)
+            if res is not None:
+                answer, r0 = res
+                frontier.prune(r0)
+                shared_incumbent.value = r0
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return answer, r0, iteration_count
+
+
+def solve(A, b, c, bounds, engine='pulp', strategy='depth',
+          branching='first', processes=1, deterministic=False):
+    """
+    Решает проблему методом ветвей и границ. Задача ЛП строится
+    один раз, в подзадачах меняются только границы переменных.
+    engine - метод решения задач ЛП: 'pulp' (решатель PuLP) или
+    'simplex' (двойственный симплекс-метод с тёплым стартом из
+    базиса родительской подзадачи); strategy - стратегия выбора
+    подзадачи, см. Frontier. При улучшении рекорда r0 подзадачи
+    с оценкой сверху не больше r0 удаляются из списка без решения.
+    branching - правило выбора переменной ветвления: 'first',
+    'fractional', 'pseudocost', 'reliability' (см. BRANCHING) или
+    объект с методами select и update; processes - число процессов,
+    решающих задачи ЛП подзадач, deterministic - повторяемый
+    параллельный поиск, см. parallel_search
+    """
+    if engine not in MODELS:
+        raise ValueError('unknown engine: %s' % engine)
+    if branching in BRANCHING:
+        branching = BRANCHING[branching]()
+    elif not hasattr(branching, 'select'):
+        raise ValueError('unknown branching: %s' % branching)
+    model = MODELS[engine](A, b, c, bounds)
+    frontier = Frontier(strategy)
+    frontier.push(INF, INF, 0, (bounds, None, None))
+
+    if processes > 1:
+        answer, r0, iteration_count = parallel_search(
+            model, frontier, branching, c, processes, deterministic,
+            (engine, A, b, c, bounds))
+    else:
+        iteration_count = 0
+        answer = None
+        r0 = 0
+        while len(frontier) > 0:
+            iteration_count += 1
+            res = iteration(model, frontier, branching, r0, c)
+            if res is not None:
+                answer, r0 = res
+                frontier.prune(r0)
 
     if answer is None:
         return None, None, None
     else:
-        return ([x.varValue for x in answer],
-                sum(xi.varValue * ci for xi, ci in zip(answer, c)),
+        return (answer,
+                sum(xi * ci for xi, ci in zip(answer, c)),
                 iteration_count)
 
 
@@ -131,177 +591,180 @@ def pulp_solve(A, b, c, bounds):
             problem.objective.value())
 
 
-import sys
-stdout = sys.stdout
+# main
+if __name__ == '__main__':
 
-f = open('BranchAndBound.txt', 'w+')
+    import sys
+    stdout = sys.stdout
+
+    f = open('BranchAndBound.txt', 'w+')
+
+    def test(msg, A, b, c, d_down, d_up):
+        bounds = []
+        for down_bound, up_bound in zip (d_down, d_up):
+            bounds.append({'low_bound' : down_bound, 'up_bound' : up_bound})
 
-def test(msg, A, b, c, d_down, d_up):
-    bounds = []
-    for down_bound, up_bound in zip (d_down, d_up):
-        bounds.append({'low_bound' : down_bound, 'up_bound' : up_bound})
-        
-    sys.stdout = f
-    print '\n', msg,
-    sys.stdout = stdout
-    status, solution, cx = pulp_solve(A, b, c, bounds)
-    if status == 'Optimal':
-        sys.stdout = f
-        result, cx, iteration_count = solve(A, b, c, bounds)
-        print ':', iteration_count, 'iterations'
-        print result
-        print 'cx =', cx
-        sys.stdout = stdout
-    else:
         sys.stdout = f
-        print '\nHas no solution'
+        print '\n', msg,
         sys.stdout = stdout
-
-# вариант 1
-A = [
-    [1,0,0,12,1,-3,4,-1],
-    [0,1,0,11,12,3,5,3],
-    [0,0,1,1,0,22,-2,1],
-]
-
-b = [40,107,61]
-c = [2,1,-2,-1,4,-5,5,5]
-d_down = [0,0,0,0,0,0,0,0]
-d_up = [3,5,5,3,4,5,6,3]
-
-test('1', A, b, c, d_down, d_up)
-
-# вариант 2
-A = [
-    [1, -3, 2,  0,  1,  -1, 4,  -1, 0],
-    [1, -1, 6,  1,  0,  -2, 2,  2,  0],
-    [2, 2,  -1, 1,  0,  -3, 8,  -1, 1],
-    [4, 1,  0,  0,  1,  -1, 0,  -1, 1],
-    [1, 1,  1,  1,  1,  1,  1,  1,  1],
-]
-
-b = [3,9,9,5,9]
-c = [-1,5,-2,4,3,1,2,8,3]
-d_down = [0,0,0,0,0,0,0,0,0]
-d_up = [5,5,5,5,5,5,5,5,5]
-
-test('2', A, b, c, d_down, d_up)
-
-# вариант 3
-A = [
-    [1,0,0,12,1,-3,4,-1,2.5,3],
-    [0,1,0,11,12,3,5,3,4,5.1],
-    [0,0,1,1,0,22,-2,1,6.1,7],
-]
-
-b = [43.5,107.3,106.3]
-c = [2,1,-2,-1,4,-5,5,5,1,2]
-d_down = [0,0,0,0,0,0,0,0,0,0]
-d_up = [2,4,5,3,4,5,4,4,5,6]
-
-test('3', A, b, c, d_down, d_up)
-
-# вариант 4
-A = [
-    [4,0,0,0,0,-3,4,-1,2,3],
-    [0,1,0,0,0,3,5,3,4,5],
-    [0,0,1,0,0,22,-2,1,6,7],
-    [0,0,0,1,0,6,-2,7,5,6],
-    [0,0,0,0,1,5,5,1,6,7],
-]
-
-b = [8,5,4,7,8]
-c = [2,1,-2,-1,4,-5,5,5,1,2]
-d_down = [0,0,0,0,0,0,0,0,0,0]
-d_up = [10,10,10,10,10,10,10,10,10,10]
-
-test('4', A, b, c, d_down, d_up)
-
-# вариант 5
-A = [
-    [1,-5,3,1,0,0],
-    [4,-1,1,0,1,0],
-    [2,4,2,0,0,1],
-]
-
-b = [-8,22,30]
-c = [7,-2,6,0,5,2]
-d_down = [2,1,0,0,1,1]
-d_up = [6,6,5,2,4,6]
-
-test('5', A, b, c, d_down, d_up)
-
-# вариант 6
-A = [
-    [1,0,0,3,1,-3,4,-1],
-    [0,1,0,4,-3,3,5,3],
-    [0,0,1,1,0,2,-2,1],
-]
-
-b = [30,78,18]
-c = [2,1,-2,-1,4,-5,5,5]
-d_down = [0,0,0,0,0,0,0,0]
-d_up = [5,5,3,5,6,7,7,8]
-
-test('6', A, b, c, d_down, d_up)
-
-# вариант 7
-A = [
-    [1, -3, 2,  0,  1,  -1,   4,  -1,  0],
-    [1, -1, 6,  1,  0,  -2,   2,  2,   0],
-    [2, 2,  -1, 1,  0,  -3,   2,  -1,  1],
-    [4, 1,  0,  0,  1,  -1,   0,  -1,  1],
-    [1, 1,  1,  1,  1,  1,    1,  1,   1],
-]
-
-b = [18,18,30,15,18]
-c = [7,5,-2,4,3,1,2,8,3]
-d_down = [0,0,0,0,0,0,0,0,0]
-d_up = [8,8,8,8,8,8,8,8,8]
-
-test('7', A, b, c, d_down, d_up)
-    
-# вариант 8
-A = [
-    [1,0,1,0,4,3,4],
-    [0,1,2,0,55,3.5,5],
-    [0,0,3,1,6,2,-2.5],
-]
-
-b = [26, 185, 32.5]
-c = [1,2,3,-1,4,-5,6]
-d_down = [0,1,0,0,0,0,0]
-d_up = [1,2,5,7,8,4,2]
-
-test('8', A, b, c, d_down, d_up)
-
-# вариант 9
-A = [
-    [2,0,1,0,0,3,5],
-    [0,2,2.1,0,0,3.5,5],
-    [0,0,3,2,0,2,1.1],
-    [0,0,3,0,2,2,-2.5],
-]
-
-b = [58,66.3,36.7,13.5]
-c = [1,2,3,1,2,3,4]
-d_down = [1,1,1,1,1,1,1]
-d_up = [2,3,4,5,8,7,7]
-
-test('9', A, b, c, d_down, d_up)
-
-# вариант 10
-A = [
-    [1,0,0,1,1,-3,4,-1,3,3],
-    [0,1,0,-2,1,1,7,3,4,5],
-    [0,0,1,1,0,2,-2,1,-4,7],
-]
-
-b = [27,6,18]
-c = [-2,1,-2,-1,8,-5,3,5,1,2]
-d_down = [0,0,0,0,0,0,0,0,0,0]
-d_up = [8,7,6,7,8,5,6,7,8,5]
-
-test('10', A, b, c, d_down, d_up)
-
-f.close()
\ No newline at end of file
+        status, solution, cx = pulp_solve(A, b, c, bounds)
+        if status == 'Optimal':
+            sys.stdout = f
+            result, cx, iteration_count = solve(A, b, c, bounds)
+            print ':', iteration_count, 'iterations'
+            print result
+            print 'cx =', cx
+            sys.stdout = stdout
+        else:
+            sys.stdout = f
+            print '\nHas no solution'
+            sys.stdout = stdout
+
+    # вариант 1
+    A = [
+        [1,0,0,12,1,-3,4,-1],
+        [0,1,0,11,12,3,5,3],
+        [0,0,1,1,0,22,-2,1],
+    ]
+
+    b = [40,107,61]
+    c = [2,1,-2,-1,4,-5,5,5]
+    d_down = [0,0,0,0,0,0,0,0]
+    d_up = [3,5,5,3,4,5,6,3]
+
+    test('1', A, b, c, d_down, d_up)
+
+    # вариант 2
+    A = [
+        [1, -3, 2,  0,  1,  -1, 4,  -1, 0],
+        [1, -1, 6,  1,  0,  -2, 2,  2,  0],
+        [2, 2,  -1, 1,  0,  -3, 8,  -1, 1],
+        [4, 1,  0,  0,  1,  -1, 0,  -1, 1],
+        [1, 1,  1,  1,  1,  1,  1,  1,  1],
+    ]
+
+    b = [3,9,9,5,9]
+    c = [-1,5,-2,4,3,1,2,8,3]
+    d_down = [0,0,0,0,0,0,0,0,0]
+    d_up = [5,5,5,5,5,5,5,5,5]
+
+    test('2', A, b, c, d_down, d_up)
+
+    # вариант 3
+    A = [
+        [1,0,0,12,1,-3,4,-1,2.5,3],
+        [0,1,0,11,12,3,5,3,4,5.1],
+        [0,0,1,1,0,22,-2,1,6.1,7],
+    ]
+
+    b = [43.5,107.3,106.3]
+    c = [2,1,-2,-1,4,-5,5,5,1,2]
+    d_down = [0,0,0,0,0,0,0,0,0,0]
+    d_up = [2,4,5,3,4,5,4,4,5,6]
+
+    test('3', A, b, c, d_down, d_up)
+
+    # вариант 4
+    A = [
+        [4,0,0,0,0,-3,4,-1,2,3],
+        [0,1,0,0,0,3,5,3,4,5],
+        [0,0,1,0,0,22,-2,1,6,7],
+        [0,0,0,1,0,6,-2,7,5,6],
+        [0,0,0,0,1,5,5,1,6,7],
+    ]
+
+    b = [8,5,4,7,8]
+    c = [2,1,-2,-1,4,-5,5,5,1,2]
+    d_down = [0,0,0,0,0,0,0,0,0,0]
+    d_up = [10,10,10,10,10,10,10,10,10,10]
+
+    test('4', A, b, c, d_down, d_up)
+
+    # вариант 5
+    A = [
+        [1,-5,3,1,0,0],
+        [4,-1,1,0,1,0],
+        [2,4,2,0,0,1],
+    ]
+
+    b = [-8,22,30]
+    c = [7,-2,6,0,5,2]
+    d_down = [2,1,0,0,1,1]
+    d_up = [6,6,5,2,4,6]
+
+    test('5', A, b, c, d_down, d_up)
+
+    # вариант 6
+    A = [
+        [1,0,0,3,1,-3,4,-1],
+        [0,1,0,4,-3,3,5,3],
+        [0,0,1,1,0,2,-2,1],
+    ]
+
+    b = [30,78,18]
+    c = [2,1,-2,-1,4,-5,5,5]
+    d_down = [0,0,0,0,0,0,0,0]
+    d_up = [5,5,3,5,6,7,7,8]
+
+    test('6', A, b, c, d_down, d_up)
+
+    # вариант 7
+    A = [
+        [1, -3, 2,  0,  1,  -1,   4,  -1,  0],
+        [1, -1, 6,  1,  0,  -2,   2,  2,   0],
+        [2, 2,  -1, 1,  0,  -3,   2,  -1,  1],
+        [4, 1,  0,  0,  1,  -1,   0,  -1,  1],
+        [1, 1,  1,  1,  1,  1,    1,  1,   1],
+    ]
+
+    b = [18,18,30,15,18]
+    c = [7,5,-2,4,3,1,2,8,3]
+    d_down = [0,0,0,0,0,0,0,0,0]
+    d_up = [8,8,8,8,8,8,8,8,8]
+
+    test('7', A, b, c, d_down, d_up)
+
+    # вариант 8
+    A = [
+        [1,0,1,0,4,3,4],
+        [0,1,2,0,55,3.5,5],
+        [0,0,3,1,6,2,-2.5],
+    ]
+
+    b = [26, 185, 32.5]
+    c = [1,2,3,-1,4,-5,6]
+    d_down = [0,1,0,0,0,0,0]
+    d_up = [1,2,5,7,8,4,2]
+
+    test('8', A, b, c, d_down, d_up)
+
+    # вариант 9
+    A = [
+        [2,0,1,0,0,3,5],
+        [0,2,2.1,0,0,3.5,5],
+        [0,0,3,2,0,2,1.1],
+        [0,0,3,0,2,2,-2.5],
+    ]
+
+    b = [58,66.3,36.7,13.5]
+    c = [1,2,3,1,2,3,4]
+    d_down = [1,1,1,1,1,1,1]
+    d_up = [2,3,4,5,8,7,7]
+
+    test('9', A, b, c, d_down, d_up)
+
+    # вариант 10
+    A = [
+        [1,0,0,1,1,-3,4,-1,3,3],
+        [0,1,0,-2,1,1,7,3,4,5],
+        [0,0,1,1,0,2,-2,1,-4,7],
+    ]
+
+    b = [27,6,18]
+    c = [-2,1,-2,-1,8,-5,3,5,1,2]
+    d_down = [0,0,0,0,0,0,0,0,0,0]
+    d_up = [8,7,6,7,8,5,6,7,8,5]
+
+    test('10', A, b, c, d_down, d_up)
+
+    f.close()
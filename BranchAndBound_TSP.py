@@ -2,10 +2,212 @@
 # -*- coding: utf-8 -*-
 
 from HungarianAlgorithm import HungarianAlgorithm
-import copy
+from MurtyAlgorithm import overlay
+from LocalSearch_TSP import initial_tour, improve_tour
+from DistanceMatrix import DistanceMatrix
+import cPickle
+import collections
+import heapq
+import multiprocessing
+import os
+import threading
+import time
+
+import numpy
 
 INF = float('inf')
 
+STRATEGIES = ('best', 'depth', 'hybrid')
+
+# версия формата точки сохранения, см. write_checkpoint
+CHECKPOINT_VERSION = 1
+
+# число запоминаемых сигнатур подзадач, см. Visited
+MEMO_SIZE = 100000
+
+# как часто (раз в сколько подзадач) проверять разрыв между рекордом
+# и оценкой снизу, см. Search.incumbents
+GAP_INTERVAL = 100
+
+# наименьший знаменатель относительного разрыва
+EPSILON = 1e-9
+
+# рекорд решения: стоимость и дуги тура, оценка снизу, относительный
+# разрыв, число просмотренных подзадач, время решения в секундах
+Incumbent = collections.namedtuple(
+    'Incumbent', 'cost indexes lower_bound gap nodes elapsed')
+
+# интервал опроса результатов процессов пула, секунды
+POLL_INTERVAL = 0.001
+
+# общие матрица стоимостей, стоимость рекорда и оценка снизу для
+# процессов пула, см. init_worker
+base_costs = None
+incumbent = None
+worker_relaxation = None
+
+
+class Frontier:
+    """
+    Список подзадач, упорядоченный по стратегии выбора:
+    'best' - подзадача с наименьшей оценкой снизу,
+    'depth' - последняя добавленная (поиск в глубину),
+    'hybrid' - поиск в глубину до первого тура, найденного методом
+    (начальный тур эвристики не в счёт), затем по наименьшей оценке
+    """
+
+    def __init__(self, strategy='best'):
+        if strategy not in STRATEGIES:
+            raise ValueError('unknown strategy: %s' % strategy)
+        self.strategy = strategy
+        self.order = 'depth' if strategy == 'hybrid' else strategy
+        self.heap = []
+        self.count = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, bound, depth, node):
+        """Добавить подзадачу node с оценкой снизу bound"""
+        count = self.count
+        self.count += 1
+        heapq.heappush(self.heap, (self.__key(bound, depth, count), count,
+                                   bound, depth, node))
+
+    def pop(self):
+        """Взять очередную подзадачу, возвращает (bound, depth, node)"""
+        key, count, bound, depth, node = heapq.heappop(self.heap)
+        return bound, depth, node
+
+    def prune(self, min_cost, keep_order=False):
+        """
+        Удалить подзадачи с оценкой не меньше стоимости рекорда min_cost.
+        В гибридной стратегии после первого рекорда перейти к выбору
+        по наименьшей оценке, если не задано keep_order.
+        """
+        if not keep_order:
+            self.order = 'depth' if self.strategy == 'depth' else 'best'
+        self.heap = [(self.__key(bound, depth, count), count,
+                      bound, depth, node)
+                     for key, count, bound, depth, node in self.heap
+                     if bound < min_cost]
+        heapq.heapify(self.heap)
+
+    def entries(self):
+        """Подзадачи списка: кортежи (номер, bound, depth, node)"""
+        return [(count, bound, depth, node)
+                for key, count, bound, depth, node in self.heap]
+
+    def restore(self, order, count, entries):
+        """Восстановить список из подзадач entries, см. entries"""
+        self.order = order
+        self.count = count
+        self.heap = [(self.__key(bound, depth, number), number,
+                      bound, depth, node)
+                     for number, bound, depth, node in entries]
+        heapq.heapify(self.heap)
+
+    def __key(self, bound, depth, count):
+        if self.order == 'best':
+            return (bound, -depth)
+        return (-count,)
+
+
+class Overlay:
+    """
+    Матрица стоимостей подзадачи для матрицы costs, строки которой
+    вычисляются по запросу (см. DistanceMatrix): то же, что overlay,
+    но строка с запрещёнными и обязательными дугами строится только
+    при обращении к ней
+    """
+
+    def __init__(self, costs, forbidden, forced):
+        self.costs = costs
+        self.shape = costs.shape
+        self.forbidden = {}
+        for i, j in forbidden:
+            self.forbidden.setdefault(i, []).append(j)
+        self.forced_rows = dict(forced)
+        self.forced_cols = dict((j, i) for i, j in forced)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            if j in self.forbidden.get(i, ()) or \
+               self.forced_rows.get(i, j) != j or \
+               self.forced_cols.get(j, i) != i:
+                return INF
+            return self.costs[i, j]
+        return self.row(key)
+
+    def __array__(self, dtype=None):
+        return numpy.array([self.row(i) for i in xrange(self.shape[0])],
+                           dtype=dtype)
+
+    def row(self, i):
+        """Строка i с наложенными дугами"""
+        row = numpy.array(self.costs[i], dtype=float)
+        if i in self.forced_rows:
+            j = self.forced_rows[i]
+            value = row[j]
+            row.fill(INF)
+            row[j] = value
+        for j, k in self.forced_cols.iteritems():
+            if k != i:
+                row[j] = INF
+        for j in self.forbidden.get(i, ()):
+            row[j] = INF
+        return row
+
+
+def node_costs(costs, forbidden, forced):
+    """
+    Матрица стоимостей подзадачи: копия costs с наложенными
+    запрещёнными и обязательными дугами или, если строки costs
+    вычисляются по запросу, Overlay
+    """
+    if isinstance(costs, numpy.ndarray):
+        return overlay(costs, forbidden, forced)
+    return Overlay(costs, forbidden, forced)
+
+
+class Visited:
+    """
+    Сигнатуры уже просмотренных подзадач - множества запрещённых и
+    обязательных дуг. Исключение подциклов приходит к одному и тому
+    же набору запрещённых дуг в разном порядке ветвления; повторная
+    подзадача уже разбита или отброшена и пропускается без решения.
+    Хранится не более size сигнатур, вытесняется та, которая дольше
+    всего не встречалась
+    """
+
+    def __init__(self, size=MEMO_SIZE):
+        self.size = size
+        self.signatures = collections.OrderedDict()
+        self.duplicates = 0
+
+    def check(self, node):
+        """Встречалась ли подзадача node раньше; запоминает её"""
+        forbidden, forced, warm = node
+        signature = (frozenset(forbidden), frozenset(forced))
+        if signature in self.signatures:
+            del self.signatures[signature]
+            self.signatures[signature] = True
+            self.duplicates += 1
+            return True
+        self.signatures[signature] = True
+        if len(self.signatures) > self.size:
+            self.signatures.popitem(last=False)
+        return False
+
+    def forget(self, node):
+        """Забыть подзадачу node, например, не решённую до остановки"""
+        forbidden, forced, warm = node
+        self.signatures.pop((frozenset(forbidden), frozenset(forced)), None)
+
 
 def print_indexes(indexes, costs):
     total = 0
@@ -28,260 +230,939 @@ def print_indexes(indexes, costs):
     print 'Total cost =', total
 
 
-def find_cycle(starting_index, indexes):
+def find_subcycles(indexes):
     """
-    Найти первый цикл, начинающийся со starting_index и
-    состоящий из элементов в indexes
+    Разбивает набор дуг indexes (назначение городов 0..n-1) на циклы
+    за O(n): дуги записываются в массив последователей, и каждый ещё
+    не пройденный город начинает новый цикл. Циклы возвращаются
+    в порядке их наименьшего города, каждый - начиная с дуги
+    из этого города
     """
-    cycle = [starting_index]
-    indexes = indexes[:]
+    n = len(indexes)
+    successor = [None] * n
+    for i, j in indexes:
+        successor[i] = j
+    visited = [False] * n
+    cycles = []
+    for start in xrange(n):
+        if visited[start]:
+            continue
+        cycle = []
+        i = start
+        while not visited[i]:
+            visited[i] = True
+            cycle.append((i, successor[i]))
+            i = successor[i]
+        cycles.append(cycle)
+    return cycles
 
-    while indexes != []:
-        last_cycle_index = cycle[-1]
 
-        for index in indexes:
-            if last_cycle_index[1] == index[0]:
-                cycle.append(index)
-                indexes.remove(index)
-                break
+def tour_to_indexes(tour):
+    """Преобразует тур (список городов) в список дуг"""
+    return [(tour[k - 1], tour[k]) for k in xrange(1, len(tour))] + \
+           [(tour[-1], tour[0])]
 
-        if last_cycle_index == cycle[-1]:
-            break
 
-    return cycle
+def improve_incumbent(costs, total, indexes):
+    """
+    Улучшить найденный методом тур локальным поиском.
+    Возвращает (стоимость, список дуг) лучшего из двух туров.
+    """
+    better, tour = improve_tour(costs, [i for i, j in indexes])
+    if better < total:
+        return better, tour_to_indexes(tour)
+    return total, indexes
 
 
-def is_one_cycle(indexes):
-    """Проверяет, является ли набор indexes одним циклом"""
-    cycle = find_cycle(indexes[0], indexes[1:])
+def one_tree(W, forced=()):
+    """
+    Минимальное 1-дерево для симметричной матрицы весов W: минимальное
+    остовное дерево на городах 1..n-1 (алгоритм Прима) и две самые
+    лёгкие дуги из города 0. Рёбра forced (пары городов) входят в
+    1-дерево обязательно: их веса уменьшаются на величину, большую
+    разброса весов. Возвращает (вес, массив рёбер) или (INF, None),
+    если 1-дерева, содержащего рёбра forced, нет.
+    """
+    n = len(W)
+    weights = W
+    if forced and numpy.isfinite(W).any():
+        finite = W[numpy.isfinite(W)]
+        shift = finite.max() - finite.min() + 1
+        W = W.copy()
+        for i, j in forced:
+            W[i, j] -= shift
+            W[j, i] -= shift
 
-    if len(cycle) == len(indexes) and cycle[0][0] == cycle[-1][1]:
-        return True
+    in_tree = numpy.zeros(n, dtype=bool)
+    in_tree[:2] = True
+    dist = W[1].copy()
+    parent = numpy.ones(n, dtype=int)
+    edges = numpy.empty((n, 2), dtype=int)
 
-    return False
+    for k in xrange(n - 2):
+        d = numpy.where(in_tree, INF, dist)
+        j = d.argmin()
+        if d[j] == INF:
+            return INF, None
+        edges[k] = parent[j], j
+        in_tree[j] = True
+        closer = W[j] < dist
+        dist[closer] = W[j][closer]
+        parent[closer] = j
 
+    nearest = W[0, 1:].argsort()[:2] + 1
+    if not numpy.isfinite(W[0, nearest]).all():
+        return INF, None
+    edges[n - 2:] = [(0, j) for j in nearest]
 
-def find_shortest_subcycle(indexes):
-    """Находит самый короткий подцикл в indexes"""
-    min_cycle = indexes[:]
-    for index in indexes:
-        temp_indexes = indexes[:]
-        temp_indexes.remove(index)
-        cycle = find_cycle(index, temp_indexes)
+    if forced:
+        # рёбра forced с циклом или тремя рёбрами у города 0
+        # в 1-дерево не помещаются
+        tree = set(map(tuple, numpy.sort(edges, axis=1).tolist()))
+        if not tree.issuperset(forced):
+            return INF, None
 
-        if len(cycle) < len(min_cycle):
-            min_cycle = cycle
+    return weights[edges[:, 0], edges[:, 1]].sum(), edges
 
-    return min_cycle
 
+class AssignmentRelaxation:
+    """
+    Оценка задачей о назначениях. Потомки запрещают по одной дуге
+    кратчайшего подцикла; потомок отличается от родителя одной
+    ячейкой, поэтому его решение восстанавливается из потенциалов
+    и назначений родителя
+    """
+
+    def evaluate(self, costs, node, min_cost):
+        """
+        Решить подзадачу node = (forbidden, forced, warm). Подзадача
+        хранит не матрицу, а только кортежи запрещённых и обязательных
+        дуг, которые накладываются на общую матрицу costs при решении.
+        Возвращает None, если подзадача не лучше рекорда min_cost,
+        иначе (оценка снизу, (стоимость, тур) или None, список потомков).
+        """
+        forbidden, forced, warm = node
+        problem = node_costs(costs, forbidden, forced)
 
-def iteration(problems, min_cost):
-    """Итерация метода"""
-    # Шаг 1, взять проблему из списка
-    problem = problems.pop()
+        # Шаг 2, решить проблему, сравнить с минимальной оценкой
+        hungarian = HungarianAlgorithm('jv')
+        try:
+            if warm is None:
+                indexes, iteration_count = hungarian.solve(problem)
+            else:
+                indexes, iteration_count = hungarian.resolve(problem, *warm)
+        except ValueError:
+            # допустимого назначения нет
+            return None
+        total = sum(costs[x, y] for x, y in indexes)
 
-    # Шаг 2, решить проблему, сравнить с минимальной оценкой
-    indexes, iteration_count = HungarianAlgorithm().solve(problem)
-    total = sum(problem[x][y] for x, y in indexes)
+        if total >= min_cost:
+            return None
 
-    if total < min_cost:
         # Шаг 3, проверить, является ли одним циклом. Если да - возврат
-        if is_one_cycle(indexes):
-            return total, find_cycle(indexes[0], indexes[1:])
+        cycles = find_subcycles(indexes)
+        if len(cycles) == 1:
+            return total, (total, cycles[0]), []
 
         # Шаг 4, выбрать подцикл с наименьшим числом дуг, сформировать
-        # на основе него новые проблемы, добавить в список
+        # на основе него новые проблемы
+        sub_cycle = min(cycles, key=len)
+        parent = (hungarian.u, hungarian.v, hungarian.row_to_col)
+        children = [(forbidden + (index,), forced, parent + ([index],))
+                    for index in sub_cycle]
+        return total, None, children
+
+
+class OneTreeRelaxation:
+    """
+    Оценка Хелда-Карпа для несимметричной задачи: минимальное
+    1-дерево по весам min(r_ij, r_ji), где r_ij = c_ij - u_i - v_j,
+    плюс sum(u) + sum(v). Стоимость тура равна sum(u) + sum(v) плюс
+    сумма r_ij по его дугам, а любой тур является 1-деревом, поэтому
+    это оценка снизу при любых потенциалах выхода u и входа v. При
+    u = v это обычная оценка по весам min(c_ij, c_ji), при потенциалах
+    задачи о назначениях - не меньше оценки задачей о назначениях;
+    с них начинает корень. Потенциалы улучшаются субградиентным
+    методом: каждое ребро 1-дерева направляется по более дешёвой
+    дуге, субградиент - 1 минус число выходящих (входящих) дуг
+    города. Потомки начинают с потенциалов родителя, и их оценка
+    с этими потенциалами не меньше оценки родителя.
+
+    Если 1-дерево - цикл, его лучшее направление даёт тур; если
+    стоимость тура больше оценки, ветвление идёт по необязательным
+    рёбрам цикла e_1..e_m. Иначе - по необязательным рёбрам,
+    инцидентным городу наибольшей степени: тур использует не более
+    двух из них. Потомок k запрещает ребро e_k (обе дуги) и делает
+    обязательными рёбра e_1..e_{k-1}, поэтому подзадачи потомков не
+    пересекаются; потомки, у которых город получил бы больше двух
+    обязательных рёбер, не создаются.
+    """
+
+    def __init__(self, iterations=100, child_iterations=50,
+                 step=2.0, patience=5):
+        """
+        iterations - число шагов субградиентного метода для корня,
+        child_iterations - для потомков,
+        step - начальный множитель шага, уменьшается вдвое после
+        patience шагов без улучшения оценки
+        """
+        self.iterations = iterations
+        self.child_iterations = child_iterations
+        self.step = step
+        self.patience = patience
+
+    def evaluate(self, costs, node, min_cost):
+        """
+        Решить подзадачу node = (forbidden, forced, potentials), см.
+        AssignmentRelaxation.evaluate. forced - не дуги, а обязательные
+        рёбра: пары городов (i, j), i < j
+        """
+        forbidden, forced, potentials = node
+        problem = numpy.asarray(node_costs(costs, forbidden, ()))
+        n = len(problem)
+        if n < 3:
+            return AssignmentRelaxation().evaluate(
+                costs, (forbidden, (), None), min_cost)
+
+        neighbours = collections.defaultdict(list)
+        for i, j in forced:
+            neighbours[i].append(j)
+            neighbours[j].append(i)
+        for city, ends in neighbours.iteritems():
+            if len(ends) > 2:
+                return None
+            if len(ends) == 2:
+                # у города оба ребра тура обязательны, остальные дуги
+                # запрещены
+                others = numpy.ones(n, dtype=bool)
+                others[ends] = False
+                problem[city, others] = INF
+                problem[others, city] = INF
+
+        if potentials is None:
+            hungarian = HungarianAlgorithm('jv')
+            try:
+                hungarian.solve(problem)
+            except ValueError:
+                # допустимого назначения нет
+                return None
+            iterations = self.iterations
+            u, v = hungarian.u.copy(), hungarian.v.copy()
+        else:
+            iterations = self.child_iterations
+            u, v = potentials.copy()
+
+        best = None
+        step = self.step
+        stall = 0
+        for k in xrange(iterations):
+            R = problem - u[:, numpy.newaxis] - v
+            weight, edges = one_tree(numpy.minimum(R, R.T), forced)
+            if edges is None:
+                return None
+            bound = u.sum() + v.sum() + weight
+            degree = numpy.bincount(edges.ravel(), minlength=n)
+
+            # направить рёбра по более дешёвым дугам
+            i, j = edges[:, 0], edges[:, 1]
+            flip = R[j, i] < R[i, j]
+            g_u = 1 - numpy.bincount(numpy.where(flip, j, i), minlength=n)
+            g_v = 1 - numpy.bincount(numpy.where(flip, i, j), minlength=n)
+            is_tour = not (g_u.any() or g_v.any())
+
+            if best is None or bound > best[0] or is_tour:
+                best = (bound, numpy.array([u, v]), edges, degree)
+                stall = 0
+            else:
+                stall += 1
+                if stall >= self.patience:
+                    step /= 2
+                    stall = 0
+            if bound >= min_cost or is_tour:
+                break
+
+            # шаг Поляка к стоимости рекорда
+            target = min_cost if min_cost < INF else \
+                     bound + abs(bound) * 0.05 + 1
+            t = step * (target - bound) / ((g_u * g_u).sum() +
+                                           (g_v * g_v).sum())
+            u += t * g_u
+            v += t * g_v
+
+        bound, potentials, edges, degree = best
+        if (problem[numpy.isfinite(problem)] % 1 == 0).all():
+            bound = numpy.ceil(bound - 1e-6)
+        if bound >= min_cost:
+            return None
+
+        tour = None
+        if (degree == 2).all():
+            # обойти цикл из города 0 и выбрать лучшее направление
+            neighbours = [[] for i in xrange(n)]
+            for i, j in edges:
+                neighbours[i].append(j)
+                neighbours[j].append(i)
+            order = [0, neighbours[0][0]]
+            while len(order) < n:
+                a, b = neighbours[order[-1]]
+                order.append(a if a != order[-2] else b)
+            tours = [tour_to_indexes(order), tour_to_indexes(order[::-1])]
+            totals = [sum(problem[i, j] for i, j in arcs) for arcs in tours]
+            k = totals.index(min(totals))
+            if totals[k] < INF:
+                tour = (totals[k], tours[k])
+            if totals[k] <= bound:
+                return bound, tour, []
+            branch = edges
         else:
-            sub_cycle = find_shortest_subcycle(indexes)
-            for index in sub_cycle:
-                new_problem = copy.deepcopy(problem)
-                new_problem[index[0]][index[1]] = INF
-                problems.append(new_problem)
+            city = degree.argmax()
+            branch = [edge for edge in edges if city in edge]
+        branch = [edge for edge in
+                  map(tuple, numpy.sort(branch, axis=1).tolist())
+                  if edge not in forced]
+
+        children = []
+        count = collections.Counter(city for edge in forced for city in edge)
+        for k, (i, j) in enumerate(branch):
+            if k > 0:
+                count.update(branch[k - 1])
+                if max(count[city] for city in branch[k - 1]) > 2:
+                    break
+            children.append((forbidden + ((i, j), (j, i)),
+                             forced + tuple(branch[:k]), potentials))
+        return bound, tour, children
+
+
+RELAXATIONS = {
+    'assignment': AssignmentRelaxation,
+    'one_tree': OneTreeRelaxation,
+}
+
+
+def init_worker(costs, shared_incumbent, shared_relaxation):
+    """
+    Инициализация процесса пула: запомнить матрицу стоимостей,
+    общую стоимость рекорда и оценку снизу
+    """
+    global base_costs, incumbent, worker_relaxation
+    base_costs = costs
+    incumbent = shared_incumbent
+    worker_relaxation = shared_relaxation
 
+
+def evaluate_worker(args):
+    """Решить подзадачу в процессе пула"""
+    bound, node = args
+    min_cost = incumbent.value
+    if bound >= min_cost:
+        return None
+    return worker_relaxation.evaluate(base_costs, node, min_cost)
+
+
+def iteration(costs, relaxation, frontier, min_cost, visited=None):
+    """
+    Итерация метода. Возвращает (стоимость, тур), если найден тур
+    лучше рекорда min_cost, иначе None. visited - уже
+    просмотренные подзадачи, см. Visited
+    """
+    # Шаг 1, взять проблему из списка. Уже просмотренная проблема и
+    # проблема, оценка которой не лучше рекорда, отбрасываются без
+    # решения
+    bound, depth, node = frontier.pop()
+    if visited is not None and visited.check(node):
+        return None
+    if bound >= min_cost:
+        return None
+
+    res = relaxation.evaluate(costs, node, min_cost)
+    if res is None:
+        return None
+
+    # Оценка родителя - оценка снизу для потомков
+    bound, tour, children = res
+    for child in children:
+        frontier.push(bound, depth + 1, child)
+
+    if tour is not None and tour[0] < min_cost:
+        return tour
     return None
 
 
-def solve(problem):
-    """
-    Решает проблему, переданную в problem,
-    методом исключения подциклов
-    """
-    problems = [problem]
-    min_cost = INF
-    min_indexes = []
-    itercount = 1
-
-    while problems != []:
-        res = iteration(problems, min_cost)
-
-        if res is not None:
-            min_cost, min_indexes = res
-
-        itercount += 1
-
-    return min_cost, min_indexes, itercount
-
-
-import sys
-stdout = sys.stdout
-
-f = open('BranchAndBound_TSP.txt', 'w+')
-
-def test(msg, costs):
-    sys.stdout = f
-    print '\n', msg,
-    sys.stdout = stdout
-    min_cost, min_indexes, itercount = solve(costs)
-    sys.stdout = f
-    print ':', itercount, 'iterations'
-    print_indexes(min_indexes, costs)
-    sys.stdout = stdout
-
-
-# вариант 1
-costs = [
-    [INF,10,25,25,10],
-    [1,INF,10,15,2],
-    [8,9,INF,20,10],
-    [14,10,24,INF,15],
-    [10,8,25,27,INF],
-]
-
-test('1', costs)
-
-# вариант 2
-costs = [
-    [INF,10,10,8,13,1],
-    [3,INF,1,17,17,7],
-    [1,10,INF,6,1,17],
-    [6,3,2,INF,5,12],
-    [8,17,8,13,INF,11],
-    [11,14,12,6,11,INF],
-]
-
-test('2', costs)
-
-# вариант 3
-costs = [
-    [INF,8,0,1,18,16,5],
-    [19,INF,12,5,11,8,17],
-    [10,19,INF,17,11,15,5],
-    [1,8,9,INF,11,2,2],
-    [11,12,14,8,INF,4,1],
-    [9,3,5,17,15,INF,19],
-    [13,6,15,13,18,10,INF],
-]
-
-test('3', costs)
-
-# вариант 4
-costs = [
-    [INF,   18,     13,     18,     8,      16,     11,     0],
-    [0,     INF,    1,      8,      2,      15,     19,     11],
-    [1,     10,     INF,    18,     5,      15,     12,     12],
-    [15,    16,     10,     INF,    16,     10,     6,      9],
-    [2,     18,     14,     16,     INF,    18,     13,     1],
-    [5,     19,     1,      19,     1,      INF,    7,      4],
-    [5,     7,      16,     0,      0,      8,      INF,    6],
-    [10,    8,      13,     10,     12,     3,      13,     INF],
-]
-
-test('4', costs)
-
-# вариант 5
-costs = [
-    [INF,13,2,17,14],
-    [11,INF,11,8,2],
-    [4,10,INF,3,6],
-    [9,4,6,INF,19],
-    [3,7,12,18,INF],
-]
-
-test('5', costs)
-
-# вариант 6
-costs = [
-    [INF,6,16,16,4,12,11,1,4,10],
-    [1,INF,16,9,17,5,3,2,6,19],
-    [19,4,INF,11,17,8,10,4,15,11],
-    [7,1,17,INF,17,2,5,6,10,17],
-    [8,18,18,13,INF,0,19,6,12,14],
-    [3,5,13,19,16,INF,12,17,2,19],
-    [1,4,1,18,2,17,INF,8,12,10],
-    [6,14,19,7,19,19,10,INF,2,9],
-    [2,14,18,0,16,17,13,15,INF,1],
-    [1,12,2,6,19,4,13,7,0,INF],
-]
-
-test('6', costs)
-
-# вариант 7
-costs = [
-    [INF,12,11,1,18,4,14,3,18],
-    [9,INF,14,12,7,10,4,18,9],
-    [7,8,INF,18,1,6,1,9,19],
-    [10,18,0,INF,3,14,3,11,4],
-    [7,3,17,10,INF,14,14,9,8],
-    [17,16,17,16,8,INF,9,3,19],
-    [13,19,8,19,12,0,INF,13,4],
-    [3,3,7,6,9,15,16,INF,15],
-    [5,13,15,19,6,5,5,2,INF],
-]
-
-test('7', costs)
-
-# вариант 8
-costs = [
-    [INF,1,14,18,11,5,13,18,17,5,11],
-    [4,INF,19,14,5,3,6,15,14,15,14],
-    [12,6,INF,16,19,15,6,2,12,15,8],
-    [14,4,18,INF,15,0,18,13,6,2,8],
-    [19,15,19,14,INF,12,9,15,3,11,16],
-    [10,6,11,4,15,INF,10,9,0,9,6],
-    [16,0,10,17,18,6,INF,4,4,1,0],
-    [7,17,17,6,7,12,10,INF,14,9,17],
-    [19,5,7,6,16,4,6,17,INF,13,14],
-    [2,11,11,16,12,7,14,12,15,INF,0],
-    [1,14,10,0,10,3,1,0,5,6,INF],
-]
-
-test('8', costs)
-
-# вариант 9
-costs = [
-    [INF,8,12,7,5,0,11,5,13,9,18,1],
-    [10,INF,14,4,7,4,10,10,6,6,4,3],
-    [4,16,INF,13,3,2,5,5,15,7,11,19],
-    [3,7,11,INF,7,6,14,3,3,8,8,18],
-    [11,15,18,12,INF,19,12,13,11,16,1,12],
-    [8,7,16,19,1,INF,3,16,12,11,0,5],
-    [5,10,8,0,17,10,INF,6,13,1,0,6],
-    [6,6,6,5,1,5,17,INF,7,14,11,5],
-    [19,8,4,19,13,2,5,14,INF,12,15,16],
-    [11,8,8,3,4,3,4,11,2,INF,4,15],
-    [9,6,12,0,18,13,14,3,12,16,INF,4],
-    [18,10,8,3,18,17,16,19,7,0,12,INF],
-]
-
-test('9', costs)
-
-# вариант 10
-costs = [
-    [INF,10,17,15,0,15,2,16,10,2,6,19,10],
-    [1,INF,9,5,13,4,13,9,18,10,14,2,9],
-    [7,9,INF,12,13,12,7,7,9,15,0,3,12],
-    [6,1,19,INF,9,17,4,1,0,10,10,15,18],
-    [13,9,9,8,INF,2,6,4,14,2,0,17,9],
-    [17,10,10,13,1,INF,14,8,14,17,14,14,2],
-    [17,18,3,2,6,0,INF,19,14,3,13,3,13],
-    [0,4,1,9,6,6,16,INF,3,19,8,15,4],
-    [15,7,5,14,6,10,1,4,INF,4,16,17,19],
-    [1,9,18,7,16,16,1,19,16,INF,1,6,12],
-    [7,6,7,13,8,18,10,5,19,9,INF,5,10],
-    [10,16,10,5,2,5,9,13,6,7,9,INF,7],
-    [18,19,4,14,13,12,7,11,8,11,12,13,INF],
-]
-
-test('10', costs)
-
-f.close()
\ No newline at end of file
+def write_checkpoint(path, header, entries):
+    """
+    Записать точку сохранения: заголовок header и подзадачи entries
+    по одной записи cPickle на подзадачу, затем None. Запись идёт во
+    временный файл, который затем переименовывается в path, поэтому
+    в path всегда лежит целая точка сохранения.
+    """
+    temp_path = path + '.tmp'
+    f = open(temp_path, 'wb')
+    try:
+        pickler = cPickle.Pickler(f, cPickle.HIGHEST_PROTOCOL)
+        pickler.dump(header)
+        for entry in entries:
+            pickler.dump(entry)
+        pickler.dump(None)
+        f.flush()
+        os.fsync(f.fileno())
+    finally:
+        f.close()
+    os.rename(temp_path, path)
+
+
+def read_checkpoint(path):
+    """Прочитать точку сохранения, возвращает (заголовок, подзадачи)"""
+    f = open(path, 'rb')
+    try:
+        unpickler = cPickle.Unpickler(f)
+        header = unpickler.load()
+        if header.get('version') != CHECKPOINT_VERSION:
+            raise ValueError('unsupported checkpoint: %s' % path)
+        entries = []
+        while True:
+            entry = unpickler.load()
+            if entry is None:
+                break
+            entries.append(entry)
+    finally:
+        f.close()
+    return header, entries
+
+
+class Checkpointer:
+    """
+    Периодическое сохранение состояния поиска в файл path не чаще
+    раза в interval секунд. Запись идёт в отдельном потоке, поиск
+    при этом продолжается; пока предыдущая запись не закончена,
+    новая не начинается
+    """
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self.last = time.time()
+        self.thread = None
+
+    def due(self):
+        """Пора ли сохранить состояние"""
+        return time.time() - self.last >= self.interval and \
+               (self.thread is None or not self.thread.is_alive())
+
+    def save(self, header, entries, wait=False):
+        """Сохранить состояние, при wait - дождаться окончания записи"""
+        self.close()
+        self.last = time.time()
+        self.thread = threading.Thread(target=write_checkpoint,
+                                       args=(self.path, header, entries))
+        self.thread.start()
+        if wait:
+            self.close()
+
+    def close(self):
+        """Дождаться окончания записи"""
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+class Search:
+    """
+    Состояние решения методом ветвей и границ: матрица стоимостей,
+    оценка снизу, список подзадач, рекорд и число итераций.
+    Состояние можно периодически сохранять в файл и продолжить
+    решение с точки сохранения, см. resume
+    """
+
+    def __init__(self, costs, relaxation, frontier, heuristic=True,
+                 memo_size=MEMO_SIZE):
+        self.costs = costs
+        self.relaxation = relaxation
+        self.frontier = frontier
+        self.heuristic = heuristic
+        self.visited = Visited(memo_size) if memo_size else None
+        self.min_cost = INF
+        self.min_indexes = []
+        self.itercount = 1
+        self.elapsed = 0.0
+        self.pending = []
+        self.checkpointer = None
+
+    def run(self, processes=1, checkpoint=None, checkpoint_interval=60.0):
+        """
+        Решать, пока список подзадач не опустеет. processes - число
+        процессов, решающих подзадачи, checkpoint - файл, в который
+        состояние сохраняется раз в checkpoint_interval секунд и по
+        окончании решения. Возвращает (стоимость, тур, число итераций).
+        """
+        for incumbent in self.incumbents(
+                processes, checkpoint=checkpoint,
+                checkpoint_interval=checkpoint_interval):
+            pass
+
+        return self.min_cost, self.min_indexes, self.itercount
+
+    def incumbents(self, processes=1, time_limit=None, node_limit=None,
+                   gap=None, checkpoint=None, checkpoint_interval=60.0):
+        """
+        Решать, возвращая (генератор) записи Incumbent: текущий рекорд
+        в начале, каждый новый рекорд и последнюю запись при остановке.
+        Решение останавливается, когда список подзадач пуст, когда
+        прошло time_limit секунд, просмотрено node_limit подзадач или
+        относительный разрыв между рекордом и оценкой снизу не больше
+        gap. После остановки по ограничению нерешённые подзадачи
+        остаются в списке, и решение можно продолжить.
+        """
+        start = time.time() - self.elapsed
+        if checkpoint is not None:
+            self.checkpointer = Checkpointer(checkpoint, checkpoint_interval)
+
+        if processes > 1:
+            steps = self.__run_parallel(processes, start)
+        else:
+            steps = self.__run_serial(start)
+        try:
+            if self.min_cost < INF:
+                yield self.incumbent(start)
+
+            for improved in steps:
+                if improved:
+                    yield self.incumbent(start)
+                if time_limit is not None and \
+                   time.time() - start >= time_limit:
+                    break
+                if node_limit is not None and \
+                   self.itercount - 1 >= node_limit:
+                    break
+                if gap is not None and \
+                   (improved or self.itercount % GAP_INTERVAL == 0) and \
+                   self.incumbent(start).gap <= gap:
+                    break
+        finally:
+            # в том числе когда потребитель закрыл генератор досрочно
+            steps.close()
+            self.elapsed = time.time() - start
+            if self.checkpointer is not None:
+                try:
+                    self.checkpointer.save(*self.snapshot(), wait=True)
+                finally:
+                    self.checkpointer.close()
+                    self.checkpointer = None
+
+        yield self.incumbent(start)
+
+    def incumbent(self, start):
+        """Запись Incumbent о текущем рекорде"""
+        lower_bound = self.lower_bound()
+        if self.min_cost == INF:
+            gap = INF
+        elif lower_bound >= self.min_cost:
+            gap = 0.0
+        else:
+            gap = (self.min_cost - lower_bound) / max(abs(self.min_cost),
+                                                      EPSILON)
+        return Incumbent(self.min_cost, list(self.min_indexes), lower_bound,
+                         gap, self.itercount - 1, time.time() - start)
+
+    def accept(self, tour):
+        """
+        Принять тур (стоимость, список дуг), найденный методом,
+        если он лучше рекорда. Возвращает True, если рекорд обновлён
+        """
+        if tour is None or tour[0] >= self.min_cost:
+            return False
+        self.min_cost, self.min_indexes = tour
+        if self.heuristic:
+            self.min_cost, self.min_indexes = \
+                improve_incumbent(self.costs, *tour)
+        self.frontier.prune(self.min_cost)
+        return True
+
+    def lower_bound(self):
+        """Наименьшая оценка снизу среди нерешённых подзадач"""
+        bounds = [bound for key, count, bound, depth, node
+                  in self.frontier.heap]
+        bounds += [bound for bound, depth, node, result in self.pending]
+        return min(bounds + [self.min_cost])
+
+    def snapshot(self):
+        """
+        Заголовок и подзадачи точки сохранения. Подзадачи, решаемые
+        процессами пула, сохраняются как нерешённые
+        """
+        entries = self.frontier.entries()
+        count = self.frontier.count
+        for bound, depth, node, result in self.pending:
+            entries.append((count, bound, depth, node))
+            count += 1
+        header = {
+            'version': CHECKPOINT_VERSION,
+            'costs': self.costs,
+            'relaxation': self.relaxation,
+            'heuristic': self.heuristic,
+            'memo_size': self.visited.size if self.visited else 0,
+            'strategy': self.frontier.strategy,
+            'order': self.frontier.order,
+            'count': count,
+            'min_cost': self.min_cost,
+            'min_indexes': self.min_indexes,
+            'itercount': self.itercount,
+            'elapsed': self.elapsed,
+            'lower_bound': self.lower_bound(),
+            'size': len(entries),
+        }
+        return header, entries
+
+    def __checkpoint(self, start):
+        """Сохранить состояние, если пора"""
+        if self.checkpointer is not None and self.checkpointer.due():
+            self.elapsed = time.time() - start
+            self.checkpointer.save(*self.snapshot())
+
+    def __run_serial(self, start):
+        """
+        Решать по одной подзадаче (генератор): после каждой
+        возвращается, обновлён ли рекорд
+        """
+        while len(self.frontier) > 0:
+            res = iteration(self.costs, self.relaxation,
+                            self.frontier, self.min_cost, self.visited)
+            improved = self.accept(res)
+            self.itercount += 1
+            self.__checkpoint(start)
+            yield improved
+
+    def __run_parallel(self, processes, start):
+        """
+        Главный процесс хранит список подзадач и раздаёт их процессам
+        пула, не более двух подзадач на процесс одновременно. Стоимость
+        рекорда общая для всех процессов, поэтому каждый из них
+        отбрасывает подзадачи, которые не лучше последнего найденного
+        тура. Генератор, как и __run_serial; при закрытии подзадачи,
+        решаемые пулом, возвращаются в список.
+        """
+        frontier = self.frontier
+        shared_incumbent = multiprocessing.Value('d', self.min_cost)
+        pool = multiprocessing.Pool(processes, init_worker,
+                                    (self.costs, shared_incumbent,
+                                     self.relaxation))
+        pending = self.pending
+
+        try:
+            while len(frontier) > 0 or pending:
+                # раздать подзадачи процессам пула
+                while len(frontier) > 0 and len(pending) < processes * 2:
+                    bound, depth, node = frontier.pop()
+                    self.itercount += 1
+                    if self.visited is not None and self.visited.check(node):
+                        continue
+                    if bound < self.min_cost:
+                        pending.append((bound, depth, node, pool.apply_async(
+                            evaluate_worker, ((bound, node),))))
+                if not pending:
+                    break
+                self.__checkpoint(start)
+
+                # дождаться любого решённого результата
+                ready = [k for k, entry in enumerate(pending)
+                         if entry[-1].ready()]
+                if not ready:
+                    pending[0][-1].wait(POLL_INTERVAL)
+                    yield False
+                    continue
+                bound, depth, node, result = pending.pop(ready[0])
+                res = result.get()
+                if res is None:
+                    yield False
+                    continue
+
+                bound, tour, children = res
+                if bound < self.min_cost:
+                    for child in children:
+                        frontier.push(bound, depth + 1, child)
+                improved = self.accept(tour)
+                if improved:
+                    shared_incumbent.value = self.min_cost
+                yield improved
+        finally:
+            pool.terminate()
+            pool.join()
+            for bound, depth, node, result in pending:
+                if self.visited is not None:
+                    self.visited.forget(node)
+                frontier.push(bound, depth, node)
+            del pending[:]
+
+
+def prepare(problem, strategy='best', heuristic=True,
+            relaxation='assignment', memo_size=MEMO_SIZE):
+    """
+    Подготовить решение проблемы problem: начальный список подзадач
+    и, при heuristic, начальный рекорд. Возвращает Search, параметры
+    см. solve
+    """
+    start = time.time()
+    if relaxation in RELAXATIONS:
+        relaxation = RELAXATIONS[relaxation]()
+    elif not hasattr(relaxation, 'evaluate'):
+        raise ValueError('unknown relaxation: %s' % relaxation)
+
+    if isinstance(problem, DistanceMatrix):
+        costs = problem
+    else:
+        costs = numpy.array(problem, dtype=float)
+    frontier = Frontier(strategy)
+    frontier.push(-INF, 0, ((), (), None))
+
+    search = Search(costs, relaxation, frontier, heuristic, memo_size)
+    if heuristic:
+        total, tour = initial_tour(costs)
+        if total < INF:
+            search.min_cost = total
+            search.min_indexes = tour_to_indexes(tour)
+            # гибридная стратегия и с начальным рекордом сначала
+            # ищет в глубину, пока метод не найдёт тур лучше
+            frontier.prune(total, keep_order=True)
+    search.elapsed = time.time() - start
+
+    return search
+
+
+def solve(problem, strategy='best', processes=1, heuristic=True,
+          relaxation='assignment', checkpoint=None, checkpoint_interval=60.0,
+          memo_size=MEMO_SIZE):
+    """
+    Решает проблему, переданную в problem (матрица стоимостей
+    или DistanceMatrix, строки которой вычисляются по запросу),
+    методом ветвей и границ. strategy - порядок
+    выбора подзадач, см. Frontier, processes - число
+    процессов, решающих подзадачи, heuristic - начать с тура,
+    найденного ближайшим соседом и локальным поиском, и улучшать
+    локальным поиском каждый новый рекорд, relaxation - оценка
+    снизу: 'assignment' (задача о назначениях, исключение подциклов),
+    'one_tree' (1-деревья Хелда-Карпа) или объект с методом evaluate,
+    см. AssignmentRelaxation. Если задан файл checkpoint, состояние
+    сохраняется в него раз в checkpoint_interval секунд, и решение
+    можно продолжить функцией resume; для этого problem и relaxation
+    должны сохраняться модулем pickle. memo_size - число запоминаемых
+    просмотренных подзадач, повторные подзадачи не решаются
+    (0 - не запоминать), см. Visited
+    """
+    search = prepare(problem, strategy, heuristic, relaxation, memo_size)
+    return search.run(processes, checkpoint, checkpoint_interval)
+
+
+def solve_anytime(problem, time_limit=None, node_limit=None, gap=None,
+                  strategy='best', processes=1, heuristic=True,
+                  relaxation='assignment', checkpoint=None,
+                  checkpoint_interval=60.0, memo_size=MEMO_SIZE):
+    """
+    Решает проблему, как solve, но возвращает (генератор) записи
+    Incumbent: начальный тур, каждый новый рекорд и последнюю запись
+    при остановке, в каждой - стоимость и дуги тура, оценку снизу,
+    относительный разрыв, число просмотренных подзадач и время от
+    начала решения. Решение останавливается по истечении time_limit
+    секунд, после node_limit подзадач или при разрыве не больше gap;
+    лучший найденный тур - в последней записи.
+    """
+    search = prepare(problem, strategy, heuristic, relaxation, memo_size)
+    return search.incumbents(processes, time_limit, node_limit, gap,
+                             checkpoint, checkpoint_interval)
+
+
+def resume(path, processes=1, checkpoint=None, checkpoint_interval=60.0):
+    """
+    Продолжает решение с точки сохранения path, записанной solve.
+    Новые точки сохранения пишутся в checkpoint (по умолчанию - в тот
+    же файл path). Возвращает то же, что solve
+    """
+    header, entries = read_checkpoint(path)
+    frontier = Frontier(header['strategy'])
+    frontier.restore(header['order'], header['count'], entries)
+
+    search = Search(header['costs'], header['relaxation'], frontier,
+                    header['heuristic'], header['memo_size'])
+    search.min_cost = header['min_cost']
+    search.min_indexes = header['min_indexes']
+    search.itercount = header['itercount']
+    search.elapsed = header['elapsed']
+
+    if checkpoint is None:
+        checkpoint = path
+    return search.run(processes, checkpoint, checkpoint_interval)
+
+
+# main
+if __name__ == '__main__':
+
+    import sys
+    stdout = sys.stdout
+
+    f = open('BranchAndBound_TSP.txt', 'w+')
+
+    def test(msg, costs, relaxation='assignment'):
+        sys.stdout = f
+        print '\n', msg,
+        sys.stdout = stdout
+        min_cost, min_indexes, itercount = solve(costs,
+                                                 relaxation=relaxation)
+        sys.stdout = f
+        print ':', itercount, 'iterations'
+        print_indexes(min_indexes, costs)
+        sys.stdout = stdout
+
+    # вариант 1
+    costs = [
+        [INF,10,25,25,10],
+        [1,INF,10,15,2],
+        [8,9,INF,20,10],
+        [14,10,24,INF,15],
+        [10,8,25,27,INF],
+    ]
+
+    test('1', costs)
+
+    # вариант 2
+    costs = [
+        [INF,10,10,8,13,1],
+        [3,INF,1,17,17,7],
+        [1,10,INF,6,1,17],
+        [6,3,2,INF,5,12],
+        [8,17,8,13,INF,11],
+        [11,14,12,6,11,INF],
+    ]
+
+    test('2', costs)
+
+    # вариант 3
+    costs = [
+        [INF,8,0,1,18,16,5],
+        [19,INF,12,5,11,8,17],
+        [10,19,INF,17,11,15,5],
+        [1,8,9,INF,11,2,2],
+        [11,12,14,8,INF,4,1],
+        [9,3,5,17,15,INF,19],
+        [13,6,15,13,18,10,INF],
+    ]
+
+    test('3', costs)
+
+    # вариант 4
+    costs = [
+        [INF,   18,     13,     18,     8,      16,     11,     0],
+        [0,     INF,    1,      8,      2,      15,     19,     11],
+        [1,     10,     INF,    18,     5,      15,     12,     12],
+        [15,    16,     10,     INF,    16,     10,     6,      9],
+        [2,     18,     14,     16,     INF,    18,     13,     1],
+        [5,     19,     1,      19,     1,      INF,    7,      4],
+        [5,     7,      16,     0,      0,      8,      INF,    6],
+        [10,    8,      13,     10,     12,     3,      13,     INF],
+    ]
+
+    test('4', costs)
+
+    # вариант 5
+    costs = [
+        [INF,13,2,17,14],
+        [11,INF,11,8,2],
+        [4,10,INF,3,6],
+        [9,4,6,INF,19],
+        [3,7,12,18,INF],
+    ]
+
+    test('5', costs)
+
+    # вариант 6
+    costs = [
+        [INF,6,16,16,4,12,11,1,4,10],
+        [1,INF,16,9,17,5,3,2,6,19],
+        [19,4,INF,11,17,8,10,4,15,11],
+        [7,1,17,INF,17,2,5,6,10,17],
+        [8,18,18,13,INF,0,19,6,12,14],
+        [3,5,13,19,16,INF,12,17,2,19],
+        [1,4,1,18,2,17,INF,8,12,10],
+        [6,14,19,7,19,19,10,INF,2,9],
+        [2,14,18,0,16,17,13,15,INF,1],
+        [1,12,2,6,19,4,13,7,0,INF],
+    ]
+
+    test('6', costs)
+
+    # вариант 7
+    costs = [
+        [INF,12,11,1,18,4,14,3,18],
+        [9,INF,14,12,7,10,4,18,9],
+        [7,8,INF,18,1,6,1,9,19],
+        [10,18,0,INF,3,14,3,11,4],
+        [7,3,17,10,INF,14,14,9,8],
+        [17,16,17,16,8,INF,9,3,19],
+        [13,19,8,19,12,0,INF,13,4],
+        [3,3,7,6,9,15,16,INF,15],
+        [5,13,15,19,6,5,5,2,INF],
+    ]
+
+    test('7', costs)
+
+    # вариант 8
+    costs = [
+        [INF,1,14,18,11,5,13,18,17,5,11],
+        [4,INF,19,14,5,3,6,15,14,15,14],
+        [12,6,INF,16,19,15,6,2,12,15,8],
+        [14,4,18,INF,15,0,18,13,6,2,8],
+        [19,15,19,14,INF,12,9,15,3,11,16],
+        [10,6,11,4,15,INF,10,9,0,9,6],
+        [16,0,10,17,18,6,INF,4,4,1,0],
+        [7,17,17,6,7,12,10,INF,14,9,17],
+        [19,5,7,6,16,4,6,17,INF,13,14],
+        [2,11,11,16,12,7,14,12,15,INF,0],
+        [1,14,10,0,10,3,1,0,5,6,INF],
+    ]
+
+    test('8', costs)
+
+    # вариант 9
+    costs = [
+        [INF,8,12,7,5,0,11,5,13,9,18,1],
+        [10,INF,14,4,7,4,10,10,6,6,4,3],
+        [4,16,INF,13,3,2,5,5,15,7,11,19],
+        [3,7,11,INF,7,6,14,3,3,8,8,18],
+        [11,15,18,12,INF,19,12,13,11,16,1,12],
+        [8,7,16,19,1,INF,3,16,12,11,0,5],
+        [5,10,8,0,17,10,INF,6,13,1,0,6],
+        [6,6,6,5,1,5,17,INF,7,14,11,5],
+        [19,8,4,19,13,2,5,14,INF,12,15,16],
+        [11,8,8,3,4,3,4,11,2,INF,4,15],
+        [9,6,12,0,18,13,14,3,12,16,INF,4],
+        [18,10,8,3,18,17,16,19,7,0,12,INF],
+    ]
+
+    test('9', costs)
+
+    # вариант 10
+    costs = [
+        [INF,10,17,15,0,15,2,16,10,2,6,19,10],
+        [1,INF,9,5,13,4,13,9,18,10,14,2,9],
+        [7,9,INF,12,13,12,7,7,9,15,0,3,12],
+        [6,1,19,INF,9,17,4,1,0,10,10,15,18],
+        [13,9,9,8,INF,2,6,4,14,2,0,17,9],
+        [17,10,10,13,1,INF,14,8,14,17,14,14,2],
+        [17,18,3,2,6,0,INF,19,14,3,13,3,13],
+        [0,4,1,9,6,6,16,INF,3,19,8,15,4],
+        [15,7,5,14,6,10,1,4,INF,4,16,17,19],
+        [1,9,18,7,16,16,1,19,16,INF,1,6,12],
+        [7,6,7,13,8,18,10,5,19,9,INF,5,10],
+        [10,16,10,5,2,5,9,13,6,7,9,INF,7],
+        [18,19,4,14,13,12,7,11,8,11,12,13,INF],
+    ]
+
+    test('10', costs)
+
+    # тот же вариант с оценкой 1-деревьями: подзадач не больше
+    test('10 (one_tree)', costs, 'one_tree')
+
+    # вариант 11: координаты городов, расстояния вычисляются по запросу
+    from DistanceMatrix import EuclideanDistances
+    points = [(0, 0), (2, 7), (5, 1), (9, 4), (4, 9), (8, 8), (1, 4), (7, 0)]
+
+    test('11', EuclideanDistances(points))
+
+    f.close()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import collections
+
+import numpy
+
+INF = float('inf')
+
+# радиус Земли, км
+EARTH_RADIUS = 6371.0
+
+
+class DistanceMatrix:
+    """
+    Матрица расстояний, строки которой вычисляются по запросу.
+    D[i] - строка i (массив numpy только для чтения), D[i, j] -
+    расстояние от i до j; на диагонали INF; D[rows, cols] для
+    массивов индексов - расстояния между парами, см. entries.
+    Последние cache_size строк хранятся в кэше, вытесняется строка,
+    к которой дольше всего не обращались. numpy.asarray(D) строит
+    полную матрицу.
+
+    Подклассы определяют compute_row(i) и, если расстояние между
+    двумя точками вычисляется быстрее строки, compute_entries.
+    """
+
+    def __init__(self, n, cache_size=1024):
+        self.n = n
+        self.shape = (n, n)
+        self.cache_size = cache_size
+        self.rows = collections.OrderedDict()
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            if numpy.ndim(i) == 0:
+                return self.row(i)[j]
+            return self.entries(i, j)
+        return self.row(key)
+
+    def __array__(self, dtype=None):
+        return numpy.array([self.row(i) for i in xrange(self.n)],
+                           dtype=dtype)
+
+    def __getstate__(self):
+        """Кэш строк не сохраняется"""
+        state = self.__dict__.copy()
+        state['rows'] = collections.OrderedDict()
+        return state
+
+    def row(self, i):
+        """Строка i из кэша или вычисленная заново"""
+        row = self.rows.pop(i, None)
+        if row is None:
+            row = numpy.array(self.compute_row(i), dtype=float)
+            row[i] = INF
+            row.flags.writeable = False
+            if self.cache_size <= 0:
+                return row
+            if len(self.rows) >= self.cache_size:
+                self.rows.popitem(last=False)
+        self.rows[i] = row
+        return row
+
+    def entries(self, rows, cols):
+        """
+        Расстояния D[rows[k], cols[k]] для массивов индексов rows и
+        cols (один из них может быть числом). Строки из кэша не
+        берутся и в кэш не попадают
+        """
+        rows, cols = numpy.broadcast_arrays(numpy.asarray(rows, dtype=int),
+                                            numpy.asarray(cols, dtype=int))
+        values = numpy.array(self.compute_entries(rows.ravel(),
+                                                  cols.ravel()),
+                             dtype=float).reshape(rows.shape)
+        values[rows == cols] = INF
+        return values
+
+    def compute_row(self, i):
+        """Вычислить расстояния от i до всех точек"""
+        raise NotImplementedError
+
+    def compute_entries(self, rows, cols):
+        """
+        Вычислить расстояния между парами точек rows[k], cols[k];
+        по умолчанию - по строкам
+        """
+        return [self.compute_row(i)[j] for i, j in zip(rows, cols)]
+
+
+class EuclideanDistances(DistanceMatrix):
+    """Евклидовы расстояния между точками points (n x d)"""
+
+    def __init__(self, points, cache_size=1024):
+        self.points = numpy.array(points, dtype=float)
+        DistanceMatrix.__init__(self, len(self.points), cache_size)
+
+    def compute_row(self, i):
+        difference = self.points - self.points[i]
+        return numpy.sqrt((difference * difference).sum(axis=1))
+
+    def compute_entries(self, rows, cols):
+        difference = self.points[cols] - self.points[rows]
+        return numpy.sqrt((difference * difference).sum(axis=1))
+
+
+class HaversineDistances(DistanceMatrix):
+    """
+    Расстояния по большому кругу между точками points - парами
+    (широта, долгота) в градусах; radius - радиус сферы (по умолчанию
+    радиус Земли в километрах)
+    """
+
+    def __init__(self, points, radius=EARTH_RADIUS, cache_size=1024):
+        points = numpy.radians(numpy.array(points, dtype=float))
+        self.latitude = points[:, 0]
+        self.longitude = points[:, 1]
+        self.radius = radius
+        DistanceMatrix.__init__(self, len(points), cache_size)
+
+    def compute_row(self, i):
+        return self.compute_entries(i, slice(None))
+
+    def compute_entries(self, rows, cols):
+        dlat = self.latitude[cols] - self.latitude[rows]
+        dlon = self.longitude[cols] - self.longitude[rows]
+        a = numpy.sin(dlat / 2) ** 2 + \
+            numpy.cos(self.latitude[rows]) * numpy.cos(self.latitude[cols]) * \
+            numpy.sin(dlon / 2) ** 2
+        return 2 * self.radius * numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1)))
+
+
+class OracleDistances(DistanceMatrix):
+    """
+    Расстояния, заданные функцией distance(i, j) для n точек.
+    Функция может быть несимметричной и возвращать INF для
+    запрещённых дуг
+    """
+
+    def __init__(self, n, distance, cache_size=1024):
+        self.distance = distance
+        DistanceMatrix.__init__(self, n, cache_size)
+
+    def compute_row(self, i):
+        return [self.distance(i, j) if i != j else INF
+                for j in xrange(self.n)]
+
+    def compute_entries(self, rows, cols):
+        return [self.distance(i, j) if i != j else INF
+                for i, j in zip(rows.tolist(), cols.tolist())]
+
+
+# main
+if __name__ == '__main__':
+
+    import sys
+    stdout = sys.stdout
+
+    f = open('DistanceMatrix.txt', 'w+')
+
+    def test(msg, distances):
+        sys.stdout = f
+        print '\n', msg
+        for i in xrange(len(distances)):
+            for j in xrange(len(distances)):
+                print '%8.1f' % distances[i, j],
+            print
+        sys.stdout = stdout
+
+    # вариант 1
+    points = [(0, 0), (3, 4), (6, 0), (3, -4)]
+
+    test('1', EuclideanDistances(points))
+
+    # вариант 2: Москва, Санкт-Петербург, Новосибирск
+    points = [(55.7558, 37.6173), (59.9343, 30.3351), (55.0084, 82.9357)]
+
+    test('2', HaversineDistances(points))
+
+    # вариант 3
+    test('3', OracleDistances(4, lambda i, j: abs(i - j) * (1 + (i < j))))
+
+    f.close()
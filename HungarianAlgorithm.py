@@ -2,30 +2,230 @@
 # -*- coding: utf-8 -*-
 
 import sys
-import copy
+import math
+import array
+import heapq
+import itertools
+import multiprocessing
+
+import numpy
+
+INF = float('inf')
+
+# число строк, обрабатываемых за раз при поиске минимума в numpy-варианте
+BLOCK_SIZE = 256
+
+
+def as_matrix(cost_matrix, lazy=False):
+    """
+    Представляет матрицу стоимостей массивом numpy, по возможности без
+    копирования. Принимаются вложенные списки, массивы numpy (в том
+    числе int32 и float32), array.array и memoryview; одномерный буфер
+    длины n * n считается квадратной матрицей, записанной по строкам.
+    Объекты с атрибутом shape, выдающие строку C[i] и элемент C[i, j]
+    (например, вычисляющие строки по запросу), при lazy возвращаются
+    как есть, иначе разворачиваются в массив.
+    """
+    if lazy and hasattr(cost_matrix, 'shape') and \
+       not isinstance(cost_matrix, (numpy.ndarray, memoryview)):
+        return cost_matrix
+    if isinstance(cost_matrix, array.array):
+        C = numpy.frombuffer(cost_matrix, dtype=cost_matrix.typecode)
+    else:
+        C = numpy.asarray(cost_matrix)
+    if C.ndim == 1:
+        n = int(round(math.sqrt(len(C))))
+        if n * n != len(C):
+            raise ValueError('cost matrix must be square')
+        C = C.reshape(n, n)
+    if C.dtype.kind not in 'iuf':
+        C = C.astype(float)
+    return C
+
+
+def augment(C, u, v, row_to_col, col_to_row, free_row):
+    """
+    Найти кратчайший увеличивающий путь из свободной строки free_row
+    (алгоритм Дейкстры по приведённым стоимостям C[i, j] - u[i] - v[j])
+    и увеличить по нему паросочетание. Потенциалы u, v и массивы
+    назначений row_to_col, col_to_row изменяются на месте.
+    Возвращает число просмотренных столбцов.
+    """
+    m = C.shape[1]
+    shortest = numpy.empty(m)
+    shortest.fill(INF)
+    pred = numpy.zeros(m, dtype=int)
+    scanned_cols = numpy.zeros(m, dtype=bool)
+    scanned_rows = []
+
+    i = free_row
+    min_val = 0.0
+    sink = -1
+    while sink < 0:
+        scanned_rows.append(i)
+        reduced = min_val + C[i] - u[i] - v
+        better = ~scanned_cols & (reduced < shortest)
+        shortest[better] = reduced[better]
+        pred[better] = i
+
+        candidates = numpy.where(scanned_cols, INF, shortest)
+        j = int(candidates.argmin())
+        min_val = candidates[j]
+        if min_val == INF:
+            raise ValueError('no feasible assignment')
+
+        scanned_cols[j] = True
+        if col_to_row[j] < 0:
+            sink = j
+        else:
+            i = col_to_row[j]
+
+    # обновить потенциалы просмотренных строк и столбцов
+    u[free_row] += min_val
+    for i in scanned_rows[1:]:
+        u[i] += min_val - shortest[row_to_col[i]]
+    v[scanned_cols] -= min_val - shortest[scanned_cols]
+
+    # чередовать назначения вдоль пути
+    j = sink
+    while True:
+        i = pred[j]
+        col_to_row[j] = i
+        j, row_to_col[i] = row_to_col[i], j
+        if i == free_row:
+            break
+
+    return int(scanned_cols.sum())
+
+
+def augment_sparse(indptr, indices, data, u, v,
+                   row_to_col, col_to_row, free_row):
+    """
+    То же, что augment, но для разреженной матрицы в формате CSR:
+    допустимые пары строки i - это indices[indptr[i]:indptr[i + 1]]
+    со стоимостями data[indptr[i]:indptr[i + 1]]. Отсутствующие пары
+    запрещены. Время пропорционально числу просмотренных рёбер.
+    """
+    shortest = {}
+    pred = {}
+    scanned_cols = set()
+    scanned_rows = []
+    heap = []
+
+    i = free_row
+    min_val = 0.0
+    sink = -1
+    while sink < 0:
+        scanned_rows.append(i)
+        start, end = indptr[i], indptr[i + 1]
+        cols = indices[start:end]
+        reduced = min_val + data[start:end] - u[i] - v[cols]
+        for j, r in zip(cols.tolist(), reduced.tolist()):
+            if j not in scanned_cols and r < shortest.get(j, INF):
+                shortest[j] = r
+                pred[j] = i
+                heapq.heappush(heap, (r, j))
+
+        while True:
+            if not heap:
+                raise ValueError('no feasible assignment')
+            min_val, j = heapq.heappop(heap)
+            if j not in scanned_cols and min_val == shortest[j]:
+                break
+
+        scanned_cols.add(j)
+        if col_to_row[j] < 0:
+            sink = j
+        else:
+            i = col_to_row[j]
+
+    u[free_row] += min_val
+    for i in scanned_rows[1:]:
+        u[i] += min_val - shortest[row_to_col[i]]
+    for j in scanned_cols:
+        v[j] -= min_val - shortest[j]
+
+    j = sink
+    while True:
+        i = pred[j]
+        col_to_row[j] = i
+        j, row_to_col[i] = row_to_col[i], j
+        if i == free_row:
+            break
+
+    return len(scanned_cols)
+
+
+def triples_to_csr(triples, n_rows):
+    """
+    Преобразует список троек (строка, столбец, стоимость)
+    в массивы CSR (indptr, indices, data)
+    """
+    triples = sorted(triples)
+    indptr = numpy.zeros(n_rows + 1, dtype=int)
+    for row, col, cost in triples:
+        indptr[row + 1] += 1
+    indptr = numpy.cumsum(indptr)
+    indices = numpy.array([col for row, col, cost in triples], dtype=int)
+    data = numpy.array([cost for row, col, cost in triples], dtype=float)
+    return indptr, indices, data
+
+
+def csr_to_triples(indptr, indices, data):
+    """Преобразует массивы CSR в список троек (строка, столбец, стоимость)"""
+    return [(i, j, cost) for i in xrange(len(indptr) - 1)
+                         for j, cost in zip(indices[indptr[i]:indptr[i + 1]],
+                                            data[indptr[i]:indptr[i + 1]])]
+
 
 class HungarianAlgorithm:
 
-    def __init__(self):
+    def __init__(self, method='munkres', inplace=False):
+        """
+        method - способ решения: 'munkres' - исходный алгоритм на списках,
+        'numpy' - тот же алгоритм на массивах numpy, 'jv' - метод
+        кратчайших увеличивающих путей с потенциалами, O(n^3).
+        inplace - для 'numpy': работать прямо в переданном буфере
+        (массиве numpy, array.array или memoryview), не копируя его;
+        содержимое буфера при этом портится. Метод 'jv' входную
+        матрицу не изменяет и никогда её не копирует.
+        """
+        self.method = method
+        self.inplace = inplace
+        self.u = None
+        self.v = None
+        self.row_to_col = None
+        self.col_to_row = None
         self.C = None
         self.row_covered = []
         self.col_covered = []
         self.n = 0
         self.Z0 = (0, 0)
-        self.marked = None
+        self.star_in_row = None
+        self.star_in_col = None
+        self.prime_in_row = None
+        self.primed_rows = None
         self.path = None
+        self.dirty = None
 
     def solve(self, cost_matrix):
         """
         Вычисляет индексы пар строка-столбец с наименьшей общей
         стоимостью. Возвращает список пар (строка, столбец).
         """
-        self.C = copy.deepcopy(cost_matrix)
+        if self.method == 'numpy':
+            return self.__solve_numpy(cost_matrix)
+        if self.method == 'jv':
+            return self.__solve_jv(cost_matrix)
+
+        if isinstance(cost_matrix, (list, tuple)):
+            self.C = [list(row) for row in cost_matrix]
+        else:
+            self.C = as_matrix(cost_matrix).tolist()
         self.n = len(self.C)
         self.__clear_covers()
         self.Z0 = (0, 0)
-        self.path = self.__make_matrix(self.n * 2, 0)
-        self.marked = self.__make_matrix(self.n, 0)
+        self.__clear_marks()
 
         steps = { 1 : self.__step1,
                   2 : self.__step2,
@@ -34,6 +234,221 @@ class HungarianAlgorithm:
                   5 : self.__step5,
                   6 : self.__step6 }
         
+        iteration_count = self.__run(steps)
+
+        # просмотреть помеченные ячейки
+        results = list(enumerate(self.star_in_row))
+
+        return results, iteration_count
+
+    def __solve_numpy(self, cost_matrix):
+        """
+        Те же шаги 1-6, но матрица стоимостей и покрытия хранятся
+        в массивах numpy, а поиск нулей, минимума и
+        модификация матрицы на шаге 6 выполняются над целыми массивами.
+        Тип элементов входного массива сохраняется; кроме копии матрицы
+        (или самого буфера в режиме inplace) память расходуется только
+        на пометки и блоки по BLOCK_SIZE строк.
+        Для каждой строки хранится признак dirty: строка без него не
+        содержит непокрытых нулей, и поиск нуля её пропускает.
+        """
+        self.C = as_matrix(cost_matrix)
+        if not self.inplace and not isinstance(cost_matrix, (list, tuple)):
+            self.C = self.C.copy()
+        self.n = len(self.C)
+        self.row_covered = numpy.zeros(self.n, dtype=bool)
+        self.col_covered = numpy.zeros(self.n, dtype=bool)
+        self.dirty = numpy.ones(self.n, dtype=bool)
+        self.Z0 = (0, 0)
+        self.__clear_marks()
+
+        steps = { 1 : self.__np_step1,
+                  2 : self.__np_step2,
+                  3 : self.__np_step3,
+                  4 : self.__np_step4,
+                  5 : self.__np_step5,
+                  6 : self.__np_step6 }
+
+        iteration_count = self.__run(steps)
+
+        results = list(enumerate(self.star_in_row))
+
+        return results, iteration_count
+
+    def __solve_jv(self, cost_matrix):
+        """
+        Метод Джонкера-Волгенанта: для каждой строки ищется кратчайший
+        увеличивающий путь, двойственные потенциалы u, v поддерживают
+        приведённые стоимости неотрицательными. Число итераций равно
+        числу увеличений паросочетания.
+        Матрица может быть прямоугольной n x m: если n <= m, назначается
+        каждая строка, иначе - каждый столбец.
+        """
+        C = as_matrix(cost_matrix, lazy=True)
+        if C.shape[0] > C.shape[1]:
+            results, iteration_count = self.__solve_jv(C.T)
+            self.__transpose_solution()
+            return sorted((i, j) for j, i in results), iteration_count
+
+        self.C = C
+        self.n = len(self.C)
+        if isinstance(C, numpy.ndarray):
+            self.u = self.C.min(axis=1).astype(float)
+        else:
+            # строки вычисляются по запросу
+            self.u = numpy.array([C[i].min() for i in xrange(self.n)],
+                                 dtype=float)
+        if numpy.isinf(self.u).any():
+            raise ValueError('no feasible assignment')
+        self.v = numpy.zeros(self.C.shape[1])
+        self.__init_matching(self.C.shape)
+
+        for i in xrange(self.n):
+            augment(self.C, self.u, self.v,
+                    self.row_to_col, self.col_to_row, i)
+
+        results = list(enumerate(self.row_to_col.tolist()))
+
+        return results, self.n
+
+    def solve_sparse(self, shape, triples=None, csr=None):
+        """
+        Решает задачу о назначениях с разреженной матрицей размера
+        shape = (n, m). Допустимые пары задаются списком троек
+        (строка, столбец, стоимость) triples либо массивами CSR
+        csr = (indptr, indices, data); отсутствующие пары запрещены.
+        Используется метод кратчайших увеличивающих путей, время
+        работы пропорционально числу допустимых пар. Если n <= m,
+        назначается каждая строка, иначе - каждый столбец.
+        Возвращает то же, что solve.
+        """
+        n_rows, n_cols = shape
+        if n_rows > n_cols:
+            if triples is None:
+                triples = csr_to_triples(*csr)
+            transposed = [(j, i, cost) for i, j, cost in triples]
+            results, iteration_count = self.solve_sparse((n_cols, n_rows),
+                                                         transposed)
+            self.__transpose_solution()
+            return sorted((i, j) for j, i in results), iteration_count
+
+        if csr is None:
+            csr = triples_to_csr(triples, n_rows)
+        indptr, indices, data = (numpy.asarray(csr[0], dtype=int),
+                                 numpy.asarray(csr[1], dtype=int),
+                                 numpy.asarray(csr[2], dtype=float))
+
+        self.C = None
+        self.n = n_rows
+        self.u = numpy.zeros(n_rows)
+        for i in xrange(n_rows):
+            if indptr[i] == indptr[i + 1]:
+                raise ValueError('no feasible assignment')
+            self.u[i] = data[indptr[i]:indptr[i + 1]].min()
+        self.v = numpy.zeros(n_cols)
+        self.__init_matching(shape)
+
+        for i in xrange(n_rows):
+            augment_sparse(indptr, indices, data, self.u, self.v,
+                           self.row_to_col, self.col_to_row, i)
+
+        results = list(enumerate(self.row_to_col.tolist()))
+
+        return results, n_rows
+
+    def resolve(self, cost_matrix, u, v, row_to_col, changed):
+        """
+        Повторно решает задачу после изменения стоимостей в ячейках
+        changed (список пар (строка, столбец)), начиная с оптимального
+        решения исходной задачи: потенциалов u, v и назначений
+        row_to_col (например, полученных из solve с method='jv').
+        Назначения, ставшие неоптимальными, снимаются, и для каждой
+        освободившейся строки выполняется одно увеличение паросочетания,
+        O(n^2). Переданные массивы не изменяются. Возвращает то же,
+        что solve.
+        """
+        C = as_matrix(cost_matrix, lazy=True)
+        n, m = C.shape
+        if n > m:
+            col_to_row = numpy.empty(m, dtype=int)
+            col_to_row.fill(-1)
+            for i, j in enumerate(row_to_col):
+                if j >= 0:
+                    col_to_row[j] = i
+            results, iteration_count = self.resolve(
+                C.T, v, u, col_to_row, [(j, i) for i, j in changed])
+            self.__transpose_solution()
+            return sorted((i, j) for j, i in results), iteration_count
+
+        # прямоугольная задача дополняется нулевыми строками,
+        # назначенными на свободные столбцы
+        self.C = C
+        if n < m:
+            self.C = numpy.zeros((m, m))
+            self.C[:n] = C
+        self.n = n
+        self.u = numpy.zeros(m)
+        self.u[:n] = u
+        self.v = numpy.array(v, dtype=float)
+        self.row_to_col = numpy.empty(m, dtype=int)
+        self.row_to_col[:n] = row_to_col
+        self.col_to_row = numpy.empty(m, dtype=int)
+        self.col_to_row.fill(-1)
+        self.col_to_row[self.row_to_col[:n]] = numpy.arange(n)
+        self.row_to_col[n:] = numpy.flatnonzero(self.col_to_row < 0)
+        self.col_to_row[self.row_to_col[n:]] = numpy.arange(n, m)
+
+        free_rows = []
+        for i, j in changed:
+            reduced = self.C[i, j] - self.u[i] - self.v[j]
+            matched = self.row_to_col[i] == j
+            if reduced < 0:
+                # восстановить допустимость потенциалов
+                self.u[i] += reduced
+            if (reduced != 0 if matched else reduced < 0) and \
+               self.row_to_col[i] >= 0:
+                self.col_to_row[self.row_to_col[i]] = -1
+                self.row_to_col[i] = -1
+                free_rows.append(i)
+
+        for i in free_rows:
+            augment(self.C, self.u, self.v,
+                    self.row_to_col, self.col_to_row, i)
+
+        if n < m:
+            # сдвинуть потенциалы так, чтобы у свободных столбцов
+            # они были нулевыми, и отбросить дополнительные строки
+            shift = self.v[self.row_to_col[n]]
+            self.u = self.u[:n] + shift
+            self.v -= shift
+            self.col_to_row[self.row_to_col[n:]] = -1
+            self.row_to_col = self.row_to_col[:n]
+            self.C = C
+
+        results = list(enumerate(self.row_to_col.tolist()))
+
+        return results, len(free_rows)
+
+    def __transpose_solution(self):
+        """
+        Перейти от решения транспонированной задачи к решению исходной:
+        поменять местами потенциалы и назначения строк и столбцов
+        """
+        if self.C is not None:
+            self.C = self.C.T
+        self.n = len(self.col_to_row)
+        self.u, self.v = self.v, self.u
+        self.row_to_col, self.col_to_row = self.col_to_row, self.row_to_col
+
+    def __init_matching(self, shape):
+        """Создать пустые массивы назначений строк и столбцов"""
+        self.row_to_col = numpy.empty(shape[0], dtype=int)
+        self.row_to_col.fill(-1)
+        self.col_to_row = numpy.empty(shape[1], dtype=int)
+        self.col_to_row.fill(-1)
+
+    def __run(self, steps):
+        """Выполнить шаги 1-6, вернуть число итераций"""
         iteration_count = 1
         step = 1
         while step < 7:
@@ -42,15 +457,30 @@ class HungarianAlgorithm:
             func = steps[step]
             step = func()
 
-        # просмотреть помеченные ячейки
-        results = [(i, j) for i, row in enumerate(self.marked) \
-                          for j, el in enumerate(row) if el == 1]
+        return iteration_count
 
-        return results, iteration_count
-
-    def __make_matrix(self, n, val):
-        """Создать n x n матрицу, заполненную val."""
-        return [[val for j in xrange(n)] for i in xrange(n)]
+    def __clear_marks(self):
+        """
+        Создать пустые индексы пометок: star_in_row[i] - столбец
+        помеченного (1) нуля в строке i, star_in_col[j] - строка
+        помеченного нуля в столбце j, prime_in_row[i] - столбец главного
+        (2) нуля в строке i; -1, если такого нуля нет
+        """
+        self.star_in_row = [-1] * self.n
+        self.star_in_col = [-1] * self.n
+        self.prime_in_row = [-1] * self.n
+        self.primed_rows = []
+        self.path = [(0, 0)] * (self.n * 2)
+
+    def __star(self, row, col):
+        """Пометить (1) нуль в ячейке (row, col)"""
+        self.star_in_row[row] = col
+        self.star_in_col[col] = row
+
+    def __prime(self, row, col):
+        """Сделать главным (2) нуль в ячейке (row, col)"""
+        self.prime_in_row[row] = col
+        self.primed_rows.append(row)
 
     def __step1(self):
         """
@@ -68,13 +498,10 @@ class HungarianAlgorithm:
         """
         for i, row in enumerate(self.C):
             for j, el in enumerate(row):
-                if (el == 0 and not self.row_covered[i] and
-                                not self.col_covered[j]):
-                    self.marked[i][j] = 1
-                    self.col_covered[j] = True
-                    self.row_covered[i] = True
+                if (el == 0 and self.star_in_row[i] < 0 and
+                                self.star_in_col[j] < 0):
+                    self.__star(i, j)
 
-        self.__clear_covers()
         return 3
 
     def __step3(self):
@@ -84,12 +511,8 @@ class HungarianAlgorithm:
         описывают полный набор уникальных назначений. В этом
         случае перейти к DONE, иначе - к шагу 4.
         """
-        count = 0
-        for i, row in enumerate(self.marked):
-            for j, (el, c_cov) in enumerate(zip(row, self.col_covered)):
-                if el == 1:
-                    self.col_covered[j] = True
-                    count += 1
+        self.col_covered = [row >= 0 for row in self.star_in_col]
+        count = self.n - self.star_in_col.count(-1)
 
         if count >= self.n:
             return 7 # done
@@ -107,8 +530,8 @@ class HungarianAlgorithm:
         while True:
             row, col = self.__find_a_zero()
             if row >= 0:
-                self.marked[row][col] = 2
-                star_col = self.__find_star_in_row(row)
+                self.__prime(row, col)
+                star_col = self.star_in_row[row]
                 if star_col >= 0:
                     self.row_covered[row] = True
                     self.col_covered[star_col] = False
@@ -128,25 +551,8 @@ class HungarianAlgorithm:
         Снять метку со всех помеченных нулей в цепи, пометить главные.
         Обнулить все главные нули, сбросить покрытие. Перейти на шаг 3.
         """
-        path = self.path
-        path[0] = self.Z0
-        count = 0
-        while True:
-            row = self.__find_star_in_col(path[count][1])
-            if row >= 0:
-                count += 1
-                path[count] = (row, path[count - 1][1])
-
-                col = self.__find_prime_in_row(path[count][0])
-                if col >= 0:
-                    count += 1
-                    path[count] = (path[count - 1][0], col)
-            else:
-                break
-
-        self.__convert_path(path, count)
+        self.__convert_path()
         self.__clear_covers()
-        self.__erase_primes()
         return 3
 
     def __step6(self):
@@ -182,51 +588,171 @@ class HungarianAlgorithm:
 
         return -1, -1
 
-    def __find_star_in_row(self, row):
+    def __convert_path(self):
         """
-        Найти первый помеченный (1) элемент в строке. Возвращает индекс
-        столбца, или -1, если такого элемента нет.
+        Построить цепь из Z0 по индексам пометок, затем пометить все
+        главные нули цепи (помеченные нули цепи при этом теряют пометку,
+        так как их строки и столбцы переходят к главным нулям) и снять
+        оставшиеся главные пометки. Время пропорционально длине цепи
+        и числу главных нулей.
         """
-        try:
-            return self.marked[row].index(1)
-        except ValueError:
-            return -1
+        path = self.path
+        path[0] = self.Z0
+        count = 0
+        while True:
+            row = self.star_in_col[path[count][1]]
+            if row >= 0:
+                count += 1
+                path[count] = (row, path[count - 1][1])
 
-    def __find_star_in_col(self, col):
-        """
-        Найти первый помеченный (1) элемент в столбце. Возвращает индекс
-        строки, или -1, если такого элемента нет.
-        """
-        try:
-            return zip(*self.marked)[col].index(1)
-        except ValueError:
-            return -1
+                col = self.prime_in_row[row]
+                count += 1
+                path[count] = (row, col)
+            else:
+                break
 
-    def __find_prime_in_row(self, row):
-        """
-        Найти первый главный (2) элемент в строке. Возвращает индекс
-        столбца, или -1, если таких элементов нет.
-        """
-        try:
-            return self.marked[row].index(2)
-        except ValueError:
-            return -1
+        for row, col in path[:count + 1:2]:
+            self.__star(row, col)
 
-    def __convert_path(self, path, count):
-        for i, path_el in zip(xrange(count + 1), path):
-            row, col = path_el[0], path_el[1]
-            value = self.marked[row][col]
-            self.marked[row][col] = 0 if value == 1 else 1
+        for row in self.primed_rows:
+            self.prime_in_row[row] = -1
+        self.primed_rows = []
 
     def __clear_covers(self):
         """Очистить все покрытые строки и столбцы"""
         self.row_covered = [False for i in xrange(self.n)]
         self.col_covered = [False for i in xrange(self.n)]
 
-    def __erase_primes(self):
-        """Очистить все главные метки"""
-        convert = lambda el: 0 if el == 2 else el
-        self.marked = [[convert(el) for el in row] for row in self.marked]
+    def __np_step1(self):
+        """Шаг 1 над массивом: вычесть минимум строки из строки"""
+        self.C -= self.C.min(axis=1)[:, numpy.newaxis]
+        return 2
+
+    def __np_step2(self):
+        """Шаг 2 над массивом: пометить независимые нули, по блокам строк"""
+        for start in xrange(0, self.n, BLOCK_SIZE):
+            rows, cols = numpy.nonzero(self.C[start:start + BLOCK_SIZE] == 0)
+            for i, j in zip((rows + start).tolist(), cols.tolist()):
+                if self.star_in_row[i] < 0 and self.star_in_col[j] < 0:
+                    self.__star(i, j)
+
+        return 3
+
+    def __np_step3(self):
+        """Шаг 3 над массивом: покрыть столбцы с помеченными нулями"""
+        self.col_covered = numpy.array(self.star_in_col) >= 0
+        self.dirty[:] = True
+
+        if self.col_covered.sum() >= self.n:
+            return 7 # done
+        else:
+            return 4
+
+    def __np_step4(self):
+        """Шаг 4 над массивом: сделать главными непокрытые нули"""
+        while True:
+            row, col = self.__np_find_a_zero()
+            if row >= 0:
+                self.__prime(row, col)
+                star_col = self.star_in_row[row]
+                if star_col >= 0:
+                    self.row_covered[row] = True
+                    self.col_covered[star_col] = False
+                    # нули открытого столбца стали непокрытыми
+                    self.dirty[self.C[:, star_col] == 0] = True
+                else:
+                    self.Z0 = (row, col)
+                    return 5
+            else:
+                return 6
+
+    def __np_step5(self):
+        """Шаг 5 над массивом: перестроить пометки вдоль цепи"""
+        self.__convert_path()
+        self.__np_clear_covers()
+        return 3
+
+    def __np_step6(self):
+        """
+        Шаг 6 над массивом. Прибавить минимум к покрытым строкам и
+        вычесть из непокрытых столбцов - это то же самое, что прибавить
+        его к дважды покрытым элементам и вычесть из непокрытых.
+        """
+        minval, zero_rows = self.__np_find_smallest()
+
+        numpy.add(self.C, minval, out=self.C,
+                  where=self.row_covered[:, numpy.newaxis])
+        numpy.subtract(self.C, minval, out=self.C,
+                       where=~self.col_covered)
+        self.dirty[zero_rows] = True
+
+        return 4
+
+    def __np_find_smallest(self):
+        """
+        Найти наименьшее непокрытое значение в массиве, обрабатывая
+        непокрытые строки блоками, чтобы не копировать всю матрицу.
+        Возвращает (минимум, строки, в которых он достигается)
+        """
+        rows = numpy.flatnonzero(~self.row_covered)
+        cols = numpy.flatnonzero(~self.col_covered)
+        minima = numpy.empty(len(rows), dtype=self.C.dtype)
+        for start in xrange(0, len(rows), BLOCK_SIZE):
+            block = self.C[rows[start:start + BLOCK_SIZE]][:, cols]
+            minima[start:start + BLOCK_SIZE] = block.min(axis=1)
+        minval = minima.min()
+        return minval, rows[minima == minval]
+
+    def __np_find_a_zero(self):
+        """
+        Найти первый непокрытый нуль в массиве. Просматриваются только
+        непокрытые строки с признаком dirty, блоками по BLOCK_SIZE;
+        строки блока без непокрытых нулей признак теряют
+        """
+        rows = numpy.flatnonzero(self.dirty & ~self.row_covered)
+        cols = numpy.flatnonzero(~self.col_covered)
+        for start in xrange(0, len(rows), BLOCK_SIZE):
+            block_rows = rows[start:start + BLOCK_SIZE]
+            zeros = self.C[block_rows][:, cols] == 0
+            found = zeros.any(axis=1)
+            if found.any():
+                i = int(found.argmax())
+                self.dirty[block_rows[:i]] = False
+                return int(block_rows[i]), int(cols[zeros[i].argmax()])
+            self.dirty[block_rows] = False
+        return -1, -1
+
+    def __np_clear_covers(self):
+        """Очистить покрытия строк и столбцов"""
+        self.row_covered = numpy.zeros(self.n, dtype=bool)
+        self.col_covered = numpy.zeros(self.n, dtype=bool)
+
+
+def solve_one(args):
+    """Решить одну задачу из пакета: args = (method, cost_matrix)"""
+    method, cost_matrix = args
+    return HungarianAlgorithm(method).solve(cost_matrix)
+
+
+def solve_batch(cost_matrices, method='jv', processes=None, chunksize=1):
+    """
+    Решает пакет независимых задач о назначениях в пуле из processes
+    процессов (по умолчанию - по числу ядер). cost_matrices - любая
+    последовательность матриц, в том числе трёхмерный массив numpy
+    матриц одного размера. Задачи передаются процессам порциями по
+    chunksize штук. Генератор: результаты solve возвращаются по мере
+    готовности в порядке входных матриц.
+    """
+    pool = multiprocessing.Pool(processes)
+    try:
+        tasks = itertools.izip(itertools.repeat(method), cost_matrices)
+        for result in pool.imap(solve_one, tasks, chunksize):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
 
 def print_matrix(matrix):
     """Вывести на экран матрицу"""
@@ -258,11 +784,12 @@ if __name__ == '__main__':
 
     f = open('HungarianAlgorithm.txt', 'w+')
 
-    def test(msg, cost_matrix):
+    def test(msg, cost_matrix, method='munkres'):
         sys.stdout = f
         print '\n', msg,
         sys.stdout = stdout
-        indexes, iteration_count = HungarianAlgorithm().solve(cost_matrix)
+        indexes, iteration_count = \
+            HungarianAlgorithm(method).solve(cost_matrix)
         sys.stdout = f
         print ':', iteration_count, 'iterations'
         for index in indexes:
@@ -391,4 +918,13 @@ if __name__ == '__main__':
     
     test('8', cost_matrix)
 
+    # вариант 9: расстояния между точками вычисляются по запросу,
+    # каждым методом
+    from DistanceMatrix import EuclideanDistances
+    points = [(0, 0), (2, 7), (5, 1), (9, 4), (4, 9), (8, 8)]
+    cost_matrix = EuclideanDistances(points)
+
+    for method in ('munkres', 'numpy', 'jv'):
+        test('9 (%s)' % method, cost_matrix, method)
+
     f.close()
\ No newline at end of file
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy
+
+from HungarianAlgorithm import INF, augment
+
+
+class IncrementalAssignment:
+    """
+    Задача о назначениях, в которую можно добавлять и из которой
+    можно удалять строки и столбцы, а также менять отдельные
+    стоимости. Оптимальное назначение и двойственные потенциалы
+    поддерживаются между изменениями: каждое изменение снимает только
+    ставшие неоптимальными назначения и восстанавливает их одним
+    увеличением паросочетания, O(n^2).
+
+    Внутри хранится квадратная матрица, дополненная пустыми строками
+    и столбцами так, что её размер не меньше суммы числа строк и числа
+    столбцов; удалённые строки и столбцы также становятся пустыми.
+    Пустая строка стоит 0 для любого столбца, пустой столбец стоит
+    idle_cost для настоящей строки (строка остаётся без работы) и 0 для
+    пустой. При idle_cost = INF каждая строка должна быть назначена,
+    поэтому число строк не может превышать число столбцов.
+    """
+
+    def __init__(self, idle_cost=INF):
+        self.idle_cost = idle_cost
+        self.C = numpy.zeros((0, 0))
+        self.u = numpy.zeros(0)
+        self.v = numpy.zeros(0)
+        self.row_to_col = numpy.zeros(0, dtype=int)
+        self.col_to_row = numpy.zeros(0, dtype=int)
+        self.row_ids = []
+        self.col_ids = []
+        self.rows = {}
+        self.cols = {}
+        self.next_id = 0
+
+    def add_row(self, costs):
+        """
+        Добавляет строку со стоимостями costs = {id столбца: стоимость};
+        отсутствующие столбцы запрещены. Возвращает id строки.
+        """
+        self.__reserve()
+        i = self.row_ids.index(None)
+        row_id = self.__new_id()
+        self.row_ids[i] = row_id
+        self.rows[row_id] = i
+        try:
+            self.__set_row(i, self.__row_costs(costs))
+        except ValueError:
+            self.__remove_row(row_id)
+            raise
+        return row_id
+
+    def remove_row(self, row_id):
+        """Удаляет строку row_id"""
+        self.__remove_row(row_id)
+
+    def add_col(self, costs):
+        """
+        Добавляет столбец со стоимостями costs = {id строки: стоимость};
+        отсутствующие строки запрещены. Возвращает id столбца.
+        """
+        self.__reserve()
+        j = self.col_ids.index(None)
+        col_id = self.__new_id()
+        self.col_ids[j] = col_id
+        self.cols[col_id] = j
+        column = numpy.array([costs.get(row_id, INF) if row_id is not None
+                              else 0 for row_id in self.row_ids])
+        try:
+            self.__set_col(j, column)
+        except ValueError:
+            self.col_ids[j] = None
+            del self.cols[col_id]
+            raise
+        return col_id
+
+    def remove_col(self, col_id):
+        """Удаляет столбец col_id"""
+        j = self.cols.pop(col_id)
+        self.col_ids[j] = None
+        try:
+            self.__set_col(j, self.__idle_col())
+        except ValueError:
+            self.col_ids[j] = col_id
+            self.cols[col_id] = j
+            raise
+
+    def update_cost(self, row_id, col_id, cost):
+        """Изменяет стоимость пары (row_id, col_id)"""
+        i, j = self.rows[row_id], self.cols[col_id]
+        old_cost = self.C[i, j]
+        self.C[i, j] = cost
+
+        reduced = cost - self.u[i] - self.v[j]
+        matched = self.row_to_col[i] == j
+        if reduced < 0:
+            # восстановить допустимость потенциалов
+            self.u[i] += reduced
+        if reduced > 0 if matched else reduced < 0:
+            self.__free_row(i)
+            try:
+                augment(self.C, self.u, self.v,
+                        self.row_to_col, self.col_to_row, i)
+            except ValueError:
+                self.C[i, j] = old_cost
+                augment(self.C, self.u, self.v,
+                        self.row_to_col, self.col_to_row, i)
+                raise
+
+    def assignment(self):
+        """Возвращает текущее назначение {id строки: id столбца}"""
+        return dict((row_id, self.col_ids[self.row_to_col[i]])
+                    for row_id, i in self.rows.iteritems()
+                    if self.col_ids[self.row_to_col[i]] is not None)
+
+    def cost(self):
+        """Возвращает суммарную стоимость текущего назначения"""
+        return sum(self.C[i, self.row_to_col[i]]
+                   for i in self.rows.itervalues())
+
+    def __new_id(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    def __reserve(self):
+        """Обеспечить место для ещё одной строки или столбца"""
+        if len(self.rows) + len(self.cols) >= len(self.C):
+            self.__grow()
+
+    def __grow(self):
+        """
+        Добавить пустую строку и пустой столбец. Потенциалы новой
+        строки и нового столбца выбираются допустимыми, затем новая
+        строка назначается одним увеличением.
+        """
+        n = len(self.C)
+        C = numpy.zeros((n + 1, n + 1))
+        C[:n, :n] = self.C
+        C[:n, n] = self.__idle_col()
+        self.C = C
+        self.row_ids.append(None)
+        self.col_ids.append(None)
+
+        self.v = numpy.append(self.v, min((C[:n, n] - self.u).min(), 0)
+                                      if n else 0)
+        self.u = numpy.append(self.u, -self.v.max())
+        self.row_to_col = numpy.append(self.row_to_col, -1)
+        self.col_to_row = numpy.append(self.col_to_row, -1)
+        augment(self.C, self.u, self.v, self.row_to_col, self.col_to_row, n)
+
+    def __row_costs(self, costs):
+        """Построить строку матрицы для стоимостей costs"""
+        return numpy.array([costs.get(col_id, INF) if col_id is not None
+                            else self.idle_cost for col_id in self.col_ids])
+
+    def __idle_col(self):
+        """Построить столбец матрицы для пустого столбца"""
+        return numpy.array([self.idle_cost if row_id is not None else 0
+                            for row_id in self.row_ids])
+
+    def __remove_row(self, row_id):
+        i = self.rows.pop(row_id)
+        self.row_ids[i] = None
+        self.__set_row(i, numpy.zeros(len(self.C)))
+
+    def __free_row(self, i):
+        """Снять назначение строки i"""
+        if self.row_to_col[i] >= 0:
+            self.col_to_row[self.row_to_col[i]] = -1
+            self.row_to_col[i] = -1
+
+    def __set_row(self, i, row):
+        """
+        Заменить строку i матрицы на row и восстановить оптимальность.
+        Если назначения нет, возвращает прежнюю строку и бросает
+        ValueError.
+        """
+        if (row - self.v).min() == INF:
+            raise ValueError('no feasible assignment')
+        old_row = self.C[i].copy()
+        self.__free_row(i)
+        self.C[i] = row
+        self.u[i] = (row - self.v).min()
+        try:
+            augment(self.C, self.u, self.v,
+                    self.row_to_col, self.col_to_row, i)
+        except ValueError:
+            self.C[i] = old_row
+            self.u[i] = (old_row - self.v).min()
+            augment(self.C, self.u, self.v,
+                    self.row_to_col, self.col_to_row, i)
+            raise
+
+    def __set_col(self, j, column):
+        """
+        Заменить столбец j матрицы на column и восстановить
+        оптимальность. Если назначения нет, возвращает прежний
+        столбец и бросает ValueError.
+        """
+        if (column - self.u).min() == INF:
+            raise ValueError('no feasible assignment')
+        old_column = self.C[:, j].copy()
+        i = self.col_to_row[j]
+        self.__free_row(i)
+        self.C[:, j] = column
+        self.v[j] = (column - self.u).min()
+        try:
+            augment(self.C, self.u, self.v,
+                    self.row_to_col, self.col_to_row, i)
+        except ValueError:
+            self.C[:, j] = old_column
+            self.v[j] = (old_column - self.u).min()
+            augment(self.C, self.u, self.v,
+                    self.row_to_col, self.col_to_row, i)
+            raise
+
+
+# main
+if __name__ == '__main__':
+
+    import sys
+    stdout = sys.stdout
+
+    f = open('IncrementalAssignment.txt', 'w+')
+
+    def show(msg, assignment):
+        sys.stdout = f
+        print '\n', msg
+        for row_id, col_id in sorted(assignment.assignment().items()):
+            print row_id, '->', col_id
+        print 'Total cost:', assignment.cost()
+        sys.stdout = stdout
+
+    assignment = IncrementalAssignment()
+    jobs = [assignment.add_col({}) for k in xrange(4)]
+    workers = [assignment.add_row(dict(zip(jobs, costs)))
+               for costs in ([6, 4, 13, 4],
+                             [17, 15, 18, 14],
+                             [3, 5, 11, 9])]
+    show('1', assignment)
+
+    assignment.update_cost(workers[0], jobs[1], 20)
+    show('2', assignment)
+
+    assignment.remove_col(jobs[0])
+    show('3', assignment)
+
+    assignment.add_col(dict(zip(workers, [1, 2, 3])))
+    assignment.remove_row(workers[1])
+    show('4', assignment)
+
+    f.close()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy
+
+from DistanceMatrix import DistanceMatrix
+
+INF = float('inf')
+
+# наименьшее улучшение, которое принимает локальный поиск
+EPSILON = 1e-9
+
+
+class PenaltyRows:
+    """
+    Матрица штрафов (см. penalty_matrix) для матрицы расстояний costs,
+    строки которой вычисляются по запросу (см. DistanceMatrix):
+    запрещённые дуги заменяются штрафом penalty при обращении. P[i] -
+    строка, P[i, j] - элемент, P[rows, cols] для массивов индексов -
+    элементы пар; полная матрица не строится
+    """
+
+    def __init__(self, costs, penalty):
+        self.costs = costs
+        self.penalty = penalty
+        self.shape = costs.shape
+
+    def __len__(self):
+        return len(self.costs)
+
+    def __getitem__(self, key):
+        values = numpy.array(self.costs[key], dtype=float)
+        values[~numpy.isfinite(values)] = self.penalty
+        if values.ndim == 0:
+            return float(values)
+        return values
+
+
+def penalty_matrix(costs):
+    """
+    Возвращает копию матрицы costs, в которой запрещённые (INF) дуги
+    заменены штрафом, превышающим разницу стоимостей любых двух туров
+    из разрешённых дуг. Локальный поиск работает с конечными
+    стоимостями и сам уходит от запрещённых дуг. Для DistanceMatrix
+    копия не строится: штраф находится по строкам, которые
+    вычисляются по одной, и возвращается PenaltyRows.
+    """
+    if isinstance(costs, DistanceMatrix):
+        low, high = INF, -INF
+        for i in xrange(len(costs)):
+            row = numpy.array(costs.compute_row(i), dtype=float)
+            row[i] = INF
+            row = row[numpy.isfinite(row)]
+            if len(row):
+                low = min(low, row.min())
+                high = max(high, row.max())
+        if low > high:
+            return PenaltyRows(costs, 0)
+        return PenaltyRows(costs, high + (high - low + 1) * len(costs))
+
+    P = numpy.array(costs, dtype=float)
+    n = len(P)
+    finite = numpy.isfinite(P)
+    if not finite.all():
+        if finite.any():
+            span = P[finite].max() - P[finite].min()
+            P[~finite] = P[finite].max() + (span + 1) * n
+        else:
+            P[~finite] = 0
+    return P
+
+
+def tour_cost(costs, tour):
+    """Стоимость замкнутого тура tour (список городов)"""
+    if isinstance(costs, (DistanceMatrix, PenaltyRows)):
+        tour = numpy.asarray(tour, dtype=int)
+        return sum(costs[numpy.roll(tour, 1), tour].tolist())
+    return sum(costs[tour[k - 1]][tour[k]] for k in xrange(len(tour)))
+
+
+def nearest_neighbour(P, start=0):
+    """
+    Тур жадным методом ближайшего соседа из города start по матрице
+    штрафов P. Возвращает список городов.
+    """
+    n = len(P)
+    visited = numpy.zeros(n, dtype=bool)
+    tour = [start]
+    visited[start] = True
+    for k in xrange(n - 1):
+        row = numpy.where(visited, INF, P[tour[-1]])
+        city = int(row.argmin())
+        tour.append(city)
+        visited[city] = True
+    return tour
+
+
+def two_opt(P, tour):
+    """
+    Улучшение тура обращением отрезков (2-opt) до локального минимума.
+    Для несимметричных стоимостей стоимость обращённого отрезка
+    считается по префиксным суммам дуг в прямом и обратном
+    направлении. Возвращает (тур, было ли улучшение).
+    """
+    tour = numpy.array(tour)
+    n = len(tour)
+    improved = False
+    if n < 4:
+        return tour.tolist(), improved
+
+    i = 0
+    while i < n - 2:
+        forward = numpy.concatenate(([0], P[tour[:-1], tour[1:]].cumsum()))
+        backward = numpy.concatenate(([0], P[tour[1:], tour[:-1]].cumsum()))
+
+        # обратить отрезок tour[i + 1..j], j > i + 1
+        a, b = tour[i], tour[i + 1]
+        j = numpy.arange(i + 2, n)
+        e = tour[j]
+        f = tour[(j + 1) % n]
+        delta = (P[a, e] + P[b, f] - P[a, b] - P[e, f] +
+                 (backward[j] - backward[i + 1]) -
+                 (forward[j] - forward[i + 1]))
+
+        k = delta.argmin()
+        if delta[k] < -EPSILON:
+            tour[i + 1:j[k] + 1] = tour[i + 1:j[k] + 1][::-1].copy()
+            improved = True
+        else:
+            i += 1
+
+    return tour.tolist(), improved
+
+
+def or_opt(P, tour, max_length=3):
+    """
+    Улучшение тура переносом отрезков длиной до max_length городов
+    в другое место тура без изменения их направления (Or-opt).
+    Возвращает (тур, было ли улучшение).
+    """
+    n = len(tour)
+    improved = False
+
+    s = 0
+    while s < n:
+        best = None
+        for length in xrange(1, min(max_length, n - 2) + 1):
+            # тур без отрезка: от следующего за отрезком города
+            # до предыдущего
+            segment = [tour[(s + k) % n] for k in xrange(length)]
+            rest = numpy.array([tour[(s + length + k) % n]
+                                for k in xrange(n - length)])
+            first, last = segment[0], segment[-1]
+            p, nx = rest[-1], rest[0]
+            gain = P[p, first] + P[last, nx] - P[p, nx]
+
+            # вставить между rest[k] и rest[k + 1], кроме прежнего места
+            after = numpy.roll(rest, -1)
+            delta = P[rest, first] + P[last, after] - P[rest, after] - gain
+            delta[-1] = INF
+            k = int(delta.argmin())
+            if delta[k] < -EPSILON and (best is None or delta[k] < best[0]):
+                best = (delta[k], segment, rest.tolist(), k)
+
+        if best is not None:
+            value, segment, rest, k = best
+            tour = rest[:k + 1] + segment + rest[k + 1:]
+            improved = True
+        else:
+            s += 1
+
+    return tour, improved
+
+
+def improve_tour(costs, tour, P=None):
+    """
+    Локальный поиск: чередовать 2-opt и Or-opt, пока тур улучшается.
+    Возвращает (стоимость, тур).
+    """
+    if P is None:
+        P = penalty_matrix(costs)
+    tour = list(tour)
+    improved = True
+    while improved:
+        tour, improved_2 = two_opt(P, tour)
+        tour, improved = or_opt(P, tour)
+        improved = improved or improved_2
+    return tour_cost(costs, tour), tour
+
+
+def initial_tour(costs, starts=10):
+    """
+    Начальный тур: ближайший сосед из нескольких (не более starts)
+    городов, затем локальный поиск для лучшего из них.
+    Возвращает (стоимость, тур); если все найденные туры проходят
+    по запрещённым дугам, стоимость равна INF.
+    """
+    P = penalty_matrix(costs)
+    n = len(P)
+    if n == 0:
+        return INF, []
+
+    step = max(n // starts, 1)
+    tours = [nearest_neighbour(P, start) for start in xrange(0, n, step)]
+    tour = min(tours, key=lambda tour: tour_cost(P, tour))
+    return improve_tour(costs, tour, P)
+
+
+# main
+if __name__ == '__main__':
+
+    import sys
+    stdout = sys.stdout
+
+    f = open('LocalSearch_TSP.txt', 'w+')
+
+    def test(msg, costs):
+        sys.stdout = f
+        print '\n', msg
+        P = penalty_matrix(costs)
+        tour = nearest_neighbour(P)
+        print 'Nearest neighbour:', [city + 1 for city in tour],
+        print 'Total cost =', tour_cost(costs, tour)
+        total, tour = initial_tour(costs)
+        print 'Local search:', [city + 1 for city in tour],
+        print 'Total cost =', total
+        sys.stdout = stdout
+
+    # вариант 1
+    costs = [
+        [INF,10,25,25,10],
+        [1,INF,10,15,2],
+        [8,9,INF,20,10],
+        [14,10,24,INF,15],
+        [10,8,25,27,INF],
+    ]
+
+    test('1', costs)
+
+    # вариант 2
+    costs = [
+        [INF,6,16,16,4,12,11,1,4,10],
+        [1,INF,16,9,17,5,3,2,6,19],
+        [19,4,INF,11,17,8,10,4,15,11],
+        [7,1,17,INF,17,2,5,6,10,17],
+        [8,18,18,13,INF,0,19,6,12,14],
+        [3,5,13,19,16,INF,12,17,2,19],
+        [1,4,1,18,2,17,INF,8,12,10],
+        [6,14,19,7,19,19,10,INF,2,9],
+        [2,14,18,0,16,17,13,15,INF,1],
+        [1,12,2,6,19,4,13,7,0,INF],
+    ]
+
+    test('2', costs)
+
+    f.close()
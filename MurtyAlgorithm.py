@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import heapq
+import itertools
+
+import numpy
+
+from HungarianAlgorithm import HungarianAlgorithm, INF
+
+
+def overlay(C, forbidden, forced):
+    """
+    Возвращает копию матрицы C, в которой запрещены пары forbidden,
+    а для пар forced запрещены все остальные пары в их строках и
+    столбцах
+    """
+    M = C.copy()
+    for i, j in forced:
+        value = M[i, j]
+        M[i] = INF
+        M[:, j] = INF
+        M[i, j] = value
+    for i, j in forbidden:
+        M[i, j] = INF
+    return M
+
+
+def k_best(cost_matrix, k=None):
+    """
+    Перечисляет назначения в порядке неубывания стоимости методом
+    Мурти. Генератор: возвращает пары (список пар (строка, столбец),
+    стоимость), не более k штук (по умолчанию - все).
+
+    Каждое разбиение хранит только списки запрещённых и обязательных
+    пар и потенциалы и назначения родителя. Разбиение попадает в
+    очередь с нижней оценкой, полученной из приведённых стоимостей
+    родителя, и решается только тогда, когда оказывается первым в
+    очереди. Потомок отличается от родителя одной запрещённой парой,
+    поэтому его решение восстанавливается из решения родителя одним
+    увеличением (HungarianAlgorithm.resolve).
+
+    Для прямоугольной матрицы назначение покрывает не все строки или
+    не все столбцы, поэтому разбиение идёт по всем свободным парам, а
+    в нижней оценке потомка учитывается только та из строки и столбца
+    запрещённой пары, которая обязательно останется назначенной.
+    """
+    C = numpy.array(cost_matrix, dtype=float)
+    square = C.shape[0] == C.shape[1]
+    hungarian = HungarianAlgorithm('jv')
+    try:
+        indexes, iteration_count = hungarian.solve(C)
+    except ValueError:
+        return
+
+    counter = itertools.count()
+    solution = (hungarian.u, hungarian.v, hungarian.row_to_col)
+    total = sum(C[i, j] for i, j in indexes)
+    queue = [(total, next(counter), indexes, solution, [], [], None)]
+
+    count = 0
+    while queue and (k is None or count < k):
+        total, _, indexes, solution, forbidden, forced, pair = \
+            heapq.heappop(queue)
+
+        if pair is not None:
+            # решить отложенное разбиение из решения родителя
+            M = overlay(C, forbidden, forced)
+            u, v, row_to_col = solution
+            try:
+                indexes, _ = hungarian.resolve(M, u, v, row_to_col, [pair])
+            except ValueError:
+                continue
+            total = sum(C[i, j] for i, j in indexes)
+            solution = (hungarian.u, hungarian.v, hungarian.row_to_col)
+            heapq.heappush(queue, (total, next(counter), indexes, solution,
+                                   forbidden, forced, None))
+            continue
+
+        yield indexes, total
+        count += 1
+
+        # разбить оставшиеся назначения: i-й потомок запрещает i-ю
+        # пару решения и обязывает все предыдущие. Стоимость потомка
+        # не меньше стоимости родителя плюс наименьшей приведённой
+        # стоимости другой пары в строке и в столбце запрещённой пары.
+        # В квадратной задаче последняя свободная пара определяется
+        # остальными, и потомок для неё не нужен
+        M = overlay(C, forbidden, forced)
+        u, v, row_to_col = solution
+        free_pairs = [pair for pair in indexes if pair not in forced]
+        if square:
+            free_pairs = free_pairs[:-1]
+        child_forced = list(forced)
+        for pair in free_pairs:
+            i, j = pair
+            value = M[i, j]
+            M[i, j] = INF
+            row = (M[i] - u[i] - v).min()
+            column = (M[:, j] - u - v[j]).min()
+            bound = total + (max(row, column) if square
+                             else min(row, column))
+            if bound < INF:
+                heapq.heappush(queue, (bound, next(counter), None,
+                                       solution, forbidden + [pair],
+                                       list(child_forced), pair))
+
+            # обязать пару для следующих потомков
+            M[i] = INF
+            M[:, j] = INF
+            M[i, j] = value
+            child_forced.append(pair)
+
+
+# main
+if __name__ == '__main__':
+
+    import sys
+    stdout = sys.stdout
+
+    f = open('MurtyAlgorithm.txt', 'w+')
+
+    def test(msg, cost_matrix, k):
+        sys.stdout = f
+        print '\n', msg
+        for indexes, total in k_best(cost_matrix, k):
+            print [j + 1 for i, j in indexes], 'Total cost:', total
+        sys.stdout = stdout
+
+    # вариант 1
+    cost_matrix = [
+        [9,6,4,9,3,8,0],
+        [5,8,6,8,8,3,5],
+        [5,2,1,1,8,6,8],
+        [1,0,9,2,5,9,2],
+        [9,2,3,3,0,3,0],
+        [7,3,0,9,4,5,6],
+        [0,9,6,0,8,8,9],
+    ]
+
+    test('1', cost_matrix, 5)
+
+    # вариант 2
+    cost_matrix = [
+        [6,5,6,8,4,0,4,6],
+        [5,7,8,7,4,4,0,9],
+        [0,7,9,2,8,7,0,3],
+        [6,6,6,3,0,3,0,8],
+        [7,4,7,1,1,1,8,9],
+        [8,0,7,5,0,9,1,3],
+        [3,2,4,7,1,7,3,4],
+        [9,2,4,3,2,4,3,9],
+    ]
+
+    test('2', cost_matrix, 5)
+
+    f.close()